@@ -0,0 +1,66 @@
+"""
+snapshot_kit — SNAPSHOT v1 / EDITS v1 tooling as an importable package.
+
+Stable Python API (submodules load on first attribute access):
+
+  Reading snapshots (snapshot_kit.reader)
+    iter_file_blocks(snapshot_path) -> Iterator[FileBlock]   lazy, byte-range blocks
+    list_files, get_file, search_regex, fuzzy_find_files, export_snapshot
+    apply_edits_to_snapshot(snapshot_path, edits_path, out_path)
+
+  Writing snapshots (snapshot_kit.writer)
+    iter_snapshot_files(root, scope_abs, includes, excludes, max_bytes) -> Iterator[SnapshotFile]
+    collect_files(...) -> List[SnapshotFile]   sorted
+    write_snapshot(out, root, scope_rel, files)
+
+  Applying edits (snapshot_kit.edits)
+    parse_edits(fp) -> (root, scope, Iterator[op])
+    iter_apply_edits(edits_file, dry_run=..., no_git=..., cwd=ROOT, ...) -> Iterator[OpResult]
+    apply_edits_file(edits_file, ...) -> List[OpResult]
+    OpResult: action, path, status (ok/dry-run/unchanged/conflict/missing), note, src
+    Errors: ParseError (bad edits / paths), PatchConflict, ApplyError (refused op);
+    search_regex raises ValueError for a bad pattern. Only the CLIs exit.
+
+CLI: python3 -m snapshot_kit {snapshot,tools,apply,backups} ...
+"""
+
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS = {
+    "FileBlock": "reader",
+    "iter_file_blocks": "reader",
+    "list_files": "reader",
+    "get_file": "reader",
+    "search_regex": "reader",
+    "fuzzy_find_files": "reader",
+    "export_snapshot": "reader",
+    "apply_edits_to_snapshot": "reader",
+    "SnapshotFile": "writer",
+    "iter_snapshot_files": "writer",
+    "collect_files": "writer",
+    "write_snapshot": "writer",
+    "ParseError": "edits",
+    "PatchConflict": "edits",
+    "ApplyError": "edits",
+    "parse_edits": "edits",
+    "OpResult": "edits",
+    "iter_apply_edits": "edits",
+    "apply_edits_file": "edits",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,192 @@
+"""
+snapshot_kit.classify — cheap text/binary classification before any full read.
+
+Order of checks for a candidate file:
+1) extension tables: known binary extensions are rejected without opening the file;
+   known text extensions skip probing (the UTF-8 read that follows is the check);
+2) cache: earlier decisions keyed by (path, size, mtime_ns), persisted across runs
+   (entries under the scanned scope that a run no longer sees are dropped on save);
+3) magic bytes / NUL in a small bounded head read;
+4) only then the full UTF-8 probe (bounded, multi-byte safe).
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+TEXT = "t"
+BINARY = "b"
+
+TEXT_EXTS = {
+    ".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".mts", ".cts",
+    ".css", ".scss", ".sass", ".less", ".html", ".htm", ".svg", ".xml",
+    ".json", ".jsonc", ".json5", ".yaml", ".yml", ".toml", ".ini", ".env",
+    ".md", ".mdx", ".txt", ".csv", ".sh", ".bash", ".zsh", ".py", ".rb",
+    ".go", ".rs", ".java", ".kt", ".swift", ".c", ".h", ".cc", ".cpp", ".hpp",
+    ".sql", ".graphql", ".gql", ".prisma", ".vue", ".svelte", ".astro",
+    ".gitignore", ".npmrc", ".editorconfig", ".lock",
+}
+
+BINARY_EXTS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".bmp", ".ico", ".icns", ".tif", ".tiff", ".heic",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".mp3", ".mp4", ".m4a", ".mov", ".webm", ".ogg", ".wav", ".flac", ".avi",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".zst", ".br",
+    ".pdf", ".psd", ".ai", ".sketch", ".fig",
+    ".wasm", ".so", ".dylib", ".dll", ".exe", ".bin", ".o", ".a", ".class", ".jar", ".pyc",
+    ".sqlite", ".db", ".lockb", ".node",
+}
+
+# (offset, signature) pairs checked against the first HEAD_BYTES bytes.
+MAGIC: List[Tuple[int, bytes]] = [
+    (0, b"\x89PNG\r\n\x1a\n"),
+    (0, b"\xff\xd8\xff"),  # JPEG
+    (0, b"GIF87a"),
+    (0, b"GIF89a"),
+    (8, b"WEBP"),  # RIFF....WEBP
+    (0, b"%PDF-"),
+    (0, b"PK\x03\x04"),  # zip / jar / docx
+    (0, b"\x1f\x8b"),  # gzip
+    (0, b"BZh"),
+    (0, b"\xfd7zXZ\x00"),
+    (0, b"7z\xbc\xaf\x27\x1c"),
+    (0, b"\x28\xb5\x2f\xfd"),  # zstd
+    (0, b"wOFF"),
+    (0, b"wOF2"),
+    (0, b"OTTO"),
+    (0, b"\x00\x01\x00\x00"),  # TrueType
+    (0, b"\x00\x00\x01\x00"),  # ICO
+    (0, b"\x00asm"),  # WebAssembly
+    (0, b"\x7fELF"),
+    (0, b"\xcf\xfa\xed\xfe"),  # Mach-O 64
+    (0, b"\xca\xfe\xba\xbe"),
+    (0, b"SQLite format 3\x00"),
+    (4, b"ftyp"),  # MP4 / MOV / HEIC / AVIF
+    (0, b"OggS"),
+    (0, b"ID3"),
+]
+
+HEAD_BYTES = 512
+PROBE_BYTES = 8192
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "snapshot_kit" / "classify.json"
+
+
+def sniff(head: bytes) -> Optional[str]:
+    """BINARY if head carries a known signature or a NUL byte, else None."""
+    for off, sig in MAGIC:
+        if head[off:off + len(sig)] == sig:
+            return BINARY
+    if b"\x00" in head:
+        return BINARY
+    return None
+
+
+def probe_utf8(f, first: bytes, limit: int = PROBE_BYTES) -> bool:
+    """Decode up to limit bytes as UTF-8; a multi-byte char cut at the end is fine."""
+    dec = codecs.getincrementaldecoder("utf-8")()
+    try:
+        dec.decode(first, final=False)
+        rest = limit - len(first)
+        if rest > 0:
+            dec.decode(f.read(rest), final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+class Classifier:
+    """
+    Text/binary decisions with a persistent (path, size, mtime_ns) cache.
+    Counters record how each decision was made. Entries looked up in this run are
+    remembered so save() can drop stale ones and keep the file bounded.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None) -> None:
+        self.cache_path = cache_path
+        self.cache: Dict[str, List] = {}
+        self.dirty = False
+        self.seen: Set[str] = set()
+        self.stats = {"ext_text": 0, "ext_binary": 0, "cached": 0, "magic": 0, "probed": 0}
+        if cache_path is not None:
+            try:
+                self.cache = json.loads(cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.cache = {}
+
+    @staticmethod
+    def by_extension(path: Path) -> Optional[str]:
+        name = path.name.lower()
+        ext = os.path.splitext(name)[1] or (name if name.startswith(".") else "")
+        if ext in BINARY_EXTS:
+            return BINARY
+        if ext in TEXT_EXTS:
+            return TEXT
+        return None
+
+    def classify(self, path: Path, st: os.stat_result) -> str:
+        """
+        TEXT or BINARY. TEXT from the extension table means "not probed"; the caller's
+        UTF-8 read is the final check.
+        """
+        kind = self.by_extension(path)
+        if kind is not None:
+            self.stats["ext_binary" if kind == BINARY else "ext_text"] += 1
+            return kind
+
+        key = str(path)
+        self.seen.add(key)
+        hit = self.cache.get(key)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            self.stats["cached"] += 1
+            return hit[2]
+
+        try:
+            with path.open("rb") as f:
+                head = f.read(HEAD_BYTES)
+                kind = sniff(head)
+                if kind is not None:
+                    self.stats["magic"] += 1
+                else:
+                    self.stats["probed"] += 1
+                    kind = TEXT if probe_utf8(f, head) else BINARY
+        except OSError:
+            return BINARY
+
+        self.cache[key] = [st.st_size, st.st_mtime_ns, kind]
+        self.dirty = True
+        return kind
+
+    def save(self, prune_under: Optional[Path] = None) -> None:
+        """
+        Write the cache back. With prune_under, entries under that directory that
+        were not looked up in this run (deleted, renamed, excluded files) are dropped.
+        """
+        if self.cache_path is None:
+            return
+        if prune_under is not None:
+            prefix = os.path.join(str(prune_under), "")
+            stale = [k for k in self.cache if k.startswith(prefix) and k not in self.seen]
+            for k in stale:
+                del self.cache[k]
+            self.dirty = self.dirty or bool(stale)
+        if not self.dirty:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", delete=False, dir=self.cache_path.parent, suffix=".tmp", encoding="utf-8"
+            ) as tf:
+                json.dump(self.cache, tf, separators=(",", ":"))
+            Path(tf.name).replace(self.cache_path)
+        except OSError:
+            pass
+        self.dirty = False
@@ -0,0 +1,46 @@
+"""
+Single CLI entry point. Each subcommand imports only its own module.
+
+  python3 -m snapshot_kit snapshot [--root ...] [--scope ...] ...   (snapshot.py)
+  python3 -m snapshot_kit tools SNAPSHOT {list,get,search,ff,apply,export} ...   (snapshot-tools.py)
+  python3 -m snapshot_kit apply EDITS [--dry-run] ...   (apply_edits.py)
+  python3 -m snapshot_kit backups {list,restore,gc} ...
+"""
+
+from __future__ import annotations
+
+import sys
+
+# subcommand -> (module, function, help)
+COMMANDS = {
+    "snapshot": ("writer", "main", "Create a SNAPSHOT v1 file"),
+    "tools": ("reader", "main", "Inspect/query a SNAPSHOT v1 file"),
+    "apply": ("edits", "main", "Apply an EDITS v1 file to the repo"),
+    "backups": ("edits", "backups_main", "List/restore/gc edit backups"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: python3 -m snapshot_kit <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<10} {meta[2]}" for name, meta in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+
+    cmd, rest = argv[0], argv[1:]
+    if cmd not in COMMANDS:
+        print(f"unknown command: {cmd}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    from importlib import import_module
+
+    module, func, _ = COMMANDS[cmd]
+    fn = getattr(import_module(f".{module}", __package__), func)
+    if cmd == "tools":
+        return fn(rest, prog="snapshot_kit tools") or 0
+    return fn(rest) or 0
@@ -0,0 +1,317 @@
+"""
+snapshot_kit.compact — opt-in, semantics-preserving content compaction for snapshots.
+
+Per-language rules:
+- JS/TS (.ts .js .mjs .cjs .mts .cts): drop comments that occupy whole lines and
+  trailing `// ...` comments. Tool pragmas (`///`, @ts-*, eslint, @jsx,
+  prettier-ignore, webpack*, sourceMappingURL) are kept.
+- TSX/JSX: only whole-line `{/* ... */}` JSX comments are dropped; a bare `// ...`
+  or `/* ... */` line may be JSX text (rendered), so other comments are kept.
+- CSS/SCSS: drop all `/* ... */` comments; one between two tokens becomes a space
+  (`1px/**/2px` must not turn into `1px2px`).
+- JSON: whitespace rules only.
+- All: strip trailing whitespace, collapse runs of blank lines, trim leading/trailing
+  blank lines.
+
+Nothing inside strings, template literals or regex literals is touched; a small
+scanner tracks them. Every compacted file gets a line map so line numbers can be
+mapped back to the original file (see encode_line_map / orig_line).
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import List, Tuple
+
+JS_EXTS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".mts", ".cts"}
+JSX_EXTS = {".tsx", ".jsx"}
+CSS_EXTS = {".css", ".scss"}
+JSON_EXTS = {".json"}
+COMPACT_EXTS = JS_EXTS | CSS_EXTS | JSON_EXTS
+
+# Rough LLM tokenizer ratio for source code.
+BYTES_PER_TOKEN = 4
+
+PRAGMA_RE = re.compile(
+    r"^(?:///|/[/*]\s*(?:@ts-|eslint|@jsx|prettier-ignore|webpack|#\s*source(?:Mapping)?URL))"
+)
+
+# Keywords after which "/" starts a regex literal rather than a division.
+REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await",
+}
+
+Span = Tuple[int, int]
+Removal = Tuple[int, int, str]  # (start, end, replacement)
+LineMap = List[Tuple[int, int]]  # (compact line, original line) at the start of each run
+
+
+def _skip_string(text: str, i: int, quote: str) -> int:
+    """Index just past a '...'/"..." literal starting at i (strings end at newline)."""
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or c == "\n":
+            return i + 1
+        i += 1
+    return n
+
+
+def _skip_template(text: str, i: int) -> int:
+    """Index just past a `...` literal starting at i, following ${...} nesting."""
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "`":
+            return i + 1
+        if c == "$" and text.startswith("${", i):
+            depth = 1
+            i += 2
+            while i < n and depth:
+                c = text[i]
+                if c in "'\"":
+                    i = _skip_string(text, i, c)
+                    continue
+                if c == "`":
+                    i = _skip_template(text, i)
+                    continue
+                depth += {"{": 1, "}": -1}.get(c, 0)
+                i += 1
+            continue
+        i += 1
+    return n
+
+
+def _skip_regex(text: str, i: int) -> int:
+    """Index just past a /.../flags literal starting at i (gives up at newline)."""
+    n = len(text)
+    i += 1
+    in_class = False
+    while i < n:
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            return i
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < n and (text[i].isalnum() or text[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return n
+
+
+def _regex_allowed(text: str, i: int) -> bool:
+    j = i - 1
+    while j >= 0 and text[j] in " \t":
+        j -= 1
+    if j < 0 or text[j] == "\n":
+        return True
+    c = text[j]
+    if c.isalnum() or c in "_$":
+        k = j
+        while k >= 0 and (text[k].isalnum() or text[k] in "_$"):
+            k -= 1
+        return text[k + 1:j + 1] in REGEX_KEYWORDS
+    return c not in ")]}\"'`"
+
+
+def scan_js(text: str) -> Tuple[List[Span], List[Span]]:
+    """Comment spans and template-literal spans of JS/TS source."""
+    comments: List[Span] = []
+    templates: List[Span] = []
+    n = len(text)
+    i = 0
+    while i < n:
+        c = text[i]
+        if c in "'\"":
+            i = _skip_string(text, i, c)
+        elif c == "`":
+            j = _skip_template(text, i)
+            templates.append((i, j))
+            i = j
+        elif c == "/" and text.startswith("//", i):
+            j = text.find("\n", i)
+            j = n if j == -1 else j
+            comments.append((i, j))
+            i = j
+        elif c == "/" and text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            j = n if j == -1 else j + 2
+            comments.append((i, j))
+            i = j
+        elif c == "/" and _regex_allowed(text, i):
+            i = _skip_regex(text, i)
+        else:
+            i += 1
+    return comments, templates
+
+
+def scan_css(text: str) -> List[Span]:
+    """Comment spans of CSS source."""
+    comments: List[Span] = []
+    n = len(text)
+    i = 0
+    while i < n:
+        c = text[i]
+        if c in "'\"":
+            i = _skip_string(text, i, c)
+        elif c == "/" and text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            j = n if j == -1 else j + 2
+            comments.append((i, j))
+            i = j
+        else:
+            i += 1
+    return comments
+
+
+def _line_start(text: str, i: int) -> int:
+    return text.rfind("\n", 0, i) + 1
+
+
+def _removals_js(text: str, comments: List[Span], jsx: bool) -> List[Removal]:
+    out: List[Removal] = []
+    for a, b in comments:
+        if PRAGMA_RE.match(text[a:b]):
+            continue
+        ls = _line_start(text, a)
+        le = text.find("\n", b)
+        le = len(text) if le == -1 else le
+        before, after = text[ls:a].strip(), text[b:le].strip()
+        if jsx:
+            # Inside JSX children a comment-looking line is text, so only the
+            # JSX comment form `{/* ... */}` on a line of its own is dropped.
+            if before == "{" and after == "}" and text.startswith("/*", a):
+                out.append((ls, min(le + 1, len(text)), ""))
+        elif not before and not after:
+            out.append((ls, min(le + 1, len(text)), ""))  # drop the line(s) entirely
+        elif text.startswith("//", a) and before:
+            out.append((a, b, ""))  # trailing line comment after code
+    return out
+
+
+def _removals_css(text: str, comments: List[Span]) -> List[Removal]:
+    out: List[Removal] = []
+    for a, b in comments:
+        ls = _line_start(text, a)
+        le = text.find("\n", b)
+        le = len(text) if le == -1 else le
+        if not text[ls:a].strip() and not text[b:le].strip():
+            out.append((ls, min(le + 1, len(text)), ""))
+        else:
+            # A comment separates tokens; keep them separated.
+            joins = a > 0 and not text[a - 1].isspace() and b < len(text) and not text[b].isspace()
+            out.append((a, b, " " if joins else ""))
+    return out
+
+
+def compact(text: str, ext: str) -> Tuple[str, LineMap]:
+    """
+    Compact text according to the rules for ext. Returns (compacted text, line map).
+    Unknown extensions are returned unchanged with an identity map.
+    """
+    ext = ext.lower()
+    templates: List[Span] = []
+    removals: List[Removal] = []
+    if ext in JS_EXTS:
+        comments, templates = scan_js(text)
+        removals = _removals_js(text, comments, jsx=ext in JSX_EXTS)
+    elif ext in CSS_EXTS:
+        removals = _removals_css(text, scan_css(text))
+    elif ext not in JSON_EXTS:
+        return text, [(1, 1)]
+
+    # Offsets of newlines that sit inside template literals (content must be kept verbatim).
+    protected = set()
+    for a, b in templates:
+        j = text.find("\n", a, b)
+        while j != -1:
+            protected.add(j)
+            j = text.find("\n", j + 1, b)
+
+    # Keep everything outside removals as (original line, text, newline protected).
+    lines: List[Tuple[int, str, bool]] = []
+    cur = ""
+    cur_origin = 0  # original line of the output line being built (0 = not started)
+    orig = 1  # original line number at offset `pos`
+    pos = 0
+    for a, b, repl in sorted(removals) + [(len(text), len(text), "")]:
+        a = max(a, pos)
+        k = pos
+        while k < a:
+            cur_origin = cur_origin or orig
+            j = text.find("\n", k, a)
+            if j == -1:
+                cur += text[k:a]
+                break
+            lines.append((cur_origin, cur + text[k:j], j in protected))
+            cur, cur_origin = "", 0
+            orig += 1
+            k = j + 1
+        if repl and b > a:
+            cur_origin = cur_origin or orig
+            cur += repl
+        orig += text.count("\n", a, max(a, b))
+        pos = max(pos, b)
+    if cur:
+        lines.append((cur_origin or orig, cur, False))
+
+    # Whitespace: trailing spaces, blank-line runs, leading/trailing blanks.
+    # Lines that start or end inside a template literal are left as they are.
+    out: List[Tuple[int, str]] = []
+    prev_prot = False
+    for origin, line, prot in lines:
+        if not prot:
+            line = line.rstrip()
+        if not line and not (prev_prot or prot) and (not out or not out[-1][1]):
+            continue
+        out.append((origin, line))
+        prev_prot = prot
+    while out and not out[-1][1]:
+        out.pop()
+
+    line_map: LineMap = []
+    for i, (origin, _) in enumerate(out, start=1):
+        if not line_map or origin - i != line_map[-1][1] - line_map[-1][0]:
+            line_map.append((i, origin))
+
+    result = "\n".join(t for _, t in out)
+    return (result + "\n" if result else ""), line_map or [(1, 1)]
+
+
+def encode_line_map(line_map: LineMap) -> str:
+    return " ".join(f"{c}:{o}" for c, o in line_map)
+
+
+def decode_line_map(text: str) -> LineMap:
+    return [(int(c), int(o)) for c, o in (pair.split(":") for pair in text.split())]
+
+
+def orig_line(line_map: LineMap, n: int) -> int:
+    """Original line number for compacted line n (1-indexed)."""
+    k = bisect.bisect_right(line_map, (n, float("inf"))) - 1
+    if k < 0:
+        return n
+    c, o = line_map[k]
+    return o + (n - c)
+
+
+def estimate_tokens(n_bytes: int) -> int:
+    return (n_bytes + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
@@ -0,0 +1,1253 @@
+"""
+snapshot_kit.edits (CLI: scripts/apply_edits.py or `python3 -m snapshot_kit apply`)
+
+Apply EDITS v1 output to the repo using CLI, safely.
+
+Supports:
+- OP: MKDIR (create folders)
+- OP: DELETE (delete files or empty folders; for non-empty folders, fails unless --force-delete-dir)
+- OP: MOVE (rename/move files or folders)
+- OP: PATCH (unified-diff-style hunks applied to the current file, with offset search)
+- FILE blocks: create/replace full file contents
+
+Safety:
+- Requires running from inside ROOT
+- Refuses to touch paths outside ROOT
+- If SCOPE is provided, refuses to touch outside ROOT/SCOPE
+- Backs up overwritten/deleted/moved files into a content-addressed store in .edits_backups/
+  (objects/<sha256> written once per unique version, plus runs/<stamp>.json per run,
+  which also lists files the run created, including MOVE destinations)
+- `backups restore` puts backed-up files back, optionally removes created files, and
+  resets the git index entries of the paths it touched to HEAD (staged renames/removals
+  from the run are undone; other staged changes to those paths are dropped too)
+
+USAGE EXAMPLES
+--------------
+# Dry run first:
+python3 scripts/apply_edits.py --dry-run edits.txt
+
+# Apply for real:
+python3 scripts/apply_edits.py edits.txt
+
+# Prefer git mv/rm when in a git repo (default behavior):
+python3 scripts/apply_edits.py edits.txt
+
+# If you want filesystem operations only:
+python3 scripts/apply_edits.py --no-git edits.txt
+
+# List backup runs, roll back the latest one, trim the store to 500 MB:
+python3 scripts/apply_edits.py backups list
+python3 scripts/apply_edits.py backups restore latest --remove-created
+python3 scripts/apply_edits.py backups gc --max-size 500M
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+
+HEADER = "EDITS v1"
+
+# FILE bodies up to this size stay in memory; larger ones spill to a temp file.
+SPOOL_MAX_BYTES = 256 * 1024
+# Once this many body bytes are held in memory, every further body spills to disk.
+SPOOL_MEMORY_BUDGET = 16 * 1024 * 1024
+
+
+@dataclass
+class OpMkdir:
+    path: str  # abs
+
+
+@dataclass
+class OpDelete:
+    path: str  # abs
+
+
+@dataclass
+class OpMove:
+    src: str  # abs
+    dst: str  # abs
+
+
+@dataclass
+class FileBlock:
+    path: str  # abs
+    size: int  # bytes (utf-8)
+    data: Optional[bytes] = None  # contents, if kept in memory
+    spill: Optional[str] = None  # named temp file holding the contents otherwise
+
+    def open(self) -> BinaryIO:
+        """
+        New read handle on the contents; the caller closes it. Spilled bodies hold no
+        file descriptor until opened, so large edit sets don't run out of them.
+        """
+        if self.spill is not None:
+            return open(self.spill, "rb")
+        return io.BytesIO(self.data or b"")
+
+    def discard(self) -> None:
+        """Drop the contents (removes the spill file). Safe to call twice."""
+        if self.spill is not None:
+            try:
+                os.unlink(self.spill)
+            except OSError:
+                pass
+        self.data = self.spill = None
+
+
+@dataclass
+class Hunk:
+    header: str  # the "@@ ... @@" line, for messages
+    old_start: Optional[int]  # 1-indexed; None when the header carries no line numbers
+    old_count: Optional[int]  # lines in the old range; 0 means "insert after line old_start"
+    lines: List[Tuple[str, str, bool]]  # (" " | "-" | "+", text, ends_with_newline)
+
+
+@dataclass
+class OpPatch:
+    path: str  # abs
+    hunks: List[Hunk]
+
+
+Edit = Union[OpMkdir, OpDelete, OpMove, OpPatch, FileBlock]
+
+
+@dataclass
+class OpResult:
+    """
+    Outcome of one applied op, as yielded by iter_apply_edits(). str() is the line the
+    CLI prints for it.
+    """
+
+    action: str  # MKDIR | MOVE | CREATE | REPLACE | PATCH | DELETE | BACKUP (run summary)
+    path: Path  # abs target (MOVE: destination; BACKUP: manifest)
+    status: str  # ok | dry-run | unchanged | conflict | missing
+    note: str = ""  # how / details: "git", "fs", "rmtree", "hunks=2", conflict reason, ...
+    src: Optional[Path] = None  # MOVE source
+    line: str = ""
+
+    def __str__(self) -> str:
+        return self.line
+
+
+class ParseError(Exception):
+    pass
+
+
+class PatchConflict(Exception):
+    pass
+
+
+class ApplyError(Exception):
+    """An edit set was refused while applying (wrong CWD, non-empty dir delete, ...)."""
+
+
+def run_git(args: List[str], cwd: Path) -> bool:
+    try:
+        subprocess.run(["git", *args], cwd=str(cwd), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return True
+    except Exception:
+        return False
+
+
+def is_git_repo(root: Path) -> bool:
+    return (root / ".git").exists()
+
+
+# Max paths per git invocation (keeps argv well under OS limits).
+GIT_PATHS_PER_CALL = 500
+ZERO_SHA = "0" * 40
+
+
+def git_output(args: List[str], cwd: Path, stdin: Optional[bytes] = None) -> Optional[bytes]:
+    """
+    Run git with literal (non-glob) pathspecs; return stdout, or None on failure.
+    """
+    try:
+        res = subprocess.run(
+            ["git", "--literal-pathspecs", *args],
+            cwd=str(cwd),
+            input=stdin,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return res.stdout
+    except Exception:
+        return None
+
+
+def chunked(items: List[str], size: int = GIT_PATHS_PER_CALL) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def git_index_entries(root: Path, rels: List[str]) -> Optional[Dict[str, Tuple[str, str, int]]]:
+    """
+    Index entries (path -> (mode, sha, stage)) at or under the given repo-relative paths,
+    in as few `git ls-files` calls as possible. None if git fails.
+    """
+    entries: Dict[str, Tuple[str, str, int]] = {}
+    for chunk in chunked(rels):
+        out = git_output(["ls-files", "-s", "-z", "--", *chunk], cwd=root)
+        if out is None:
+            return None
+        for rec in out.decode("utf-8", errors="surrogateescape").split("\0"):
+            if not rec:
+                continue
+            meta, path = rec.split("\t", 1)
+            mode, sha, stage = meta.split(" ")
+            entries[path] = (mode, sha, int(stage))
+    return entries
+
+
+def entries_under(entries: Dict[str, Tuple[str, str, int]], rel: str) -> List[str]:
+    prefix = rel + "/"
+    return [p for p in entries if p == rel or p.startswith(prefix)]
+
+
+def dependent_moves(rels: List[Tuple[str, str]]) -> Set[int]:
+    """
+    Indices of moves that share a path with another move (equal, or one nested under
+    the other), e.g. both halves of a -> b, b -> c. Those must run in order; every
+    other move is independent of the rest and can be batched.
+    """
+    owners: Dict[str, Set[int]] = {}
+    for i, pair in enumerate(rels):
+        for rel in pair:
+            owners.setdefault(rel, set()).add(i)
+    dependent: Set[int] = set()
+    for rel, idxs in owners.items():
+        if len(idxs) > 1:
+            dependent |= idxs
+        parts = rel.split("/")
+        for k in range(1, len(parts)):
+            above = owners.get("/".join(parts[:k]))
+            if above:
+                dependent |= above | idxs
+    return dependent
+
+
+def git_batch_move(root: Path, moves: List[Tuple[Path, Path]]) -> Optional[List[bool]]:
+    """
+    Rename on disk, then stage the renames that succeeded with one
+    `git update-index --index-info` (what `git mv` does per path). Returns, per
+    move, True if it went through git, False if it must be handled per path
+    (untracked source, existing destination, missing parent, conflicts, or the
+    rename itself failed). Returns None if the batch could not be staged, in which
+    case the renames are undone and nothing was touched.
+
+    Moves must be independent (no move reads or writes another move's paths).
+    """
+    rels = [(s.relative_to(root).as_posix(), d.relative_to(root).as_posix()) for s, d in moves]
+    entries = git_index_entries(root, [s for s, _ in rels])
+    if entries is None:
+        return None
+
+    batched: List[bool] = []
+    for (src, dst), (src_rel, _) in zip(moves, rels):
+        tracked = entries_under(entries, src_rel)
+        ok = (
+            bool(tracked)
+            and all(entries[t][2] == 0 for t in tracked)
+            and src.exists()
+            and not dst.exists()
+            and dst.parent.is_dir()
+        )
+        if ok:
+            try:
+                os.rename(src, dst)
+            except OSError:
+                ok = False  # left for the per-path fallback, which reports the error
+        batched.append(ok)
+
+    # Only renames that happened on disk are staged, so the index never records a
+    # move that did not take place.
+    info: List[str] = []
+    for ok, (src_rel, dst_rel) in zip(batched, rels):
+        if not ok:
+            continue
+        for old in entries_under(entries, src_rel):
+            mode, sha, _ = entries[old]
+            new = dst_rel + old[len(src_rel):]
+            info.append(f"0 {ZERO_SHA}\t{old}")
+            info.append(f"{mode} {sha}\t{new}")
+
+    if info:
+        stdin = ("\0".join(info) + "\0").encode("utf-8", errors="surrogateescape")
+        if git_output(["update-index", "-z", "--index-info"], cwd=root, stdin=stdin) is None:
+            for (src, dst), ok in zip(moves, batched):
+                if ok:
+                    os.rename(dst, src)
+            return None
+    return batched
+
+
+def git_batch_rm(root: Path, rels: List[str]) -> bool:
+    """
+    `git rm -f` many tracked paths in as few calls as possible.
+    """
+    return all(git_output(["rm", "-f", "-q", "--", *chunk], cwd=root) is not None for chunk in chunked(rels))
+
+
+def ensure_under_root(root: Path, p: Path) -> None:
+    try:
+        p.relative_to(root)
+    except Exception:
+        raise ParseError(f"Refusing to touch path outside ROOT:\n  ROOT: {root}\n  PATH: {p}")
+
+
+def ensure_in_scope(root: Path, scope_rel: str, p: Path) -> None:
+    scope_abs = (root / scope_rel).resolve()
+    try:
+        p.relative_to(scope_abs)
+    except Exception:
+        raise ParseError(f"Refusing to touch path outside SCOPE:\n  SCOPE: {scope_abs}\n  PATH:  {p}")
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask() can only be queried by setting it, which is not
+# safe while worker threads create files.
+UMASK = _current_umask()
+
+
+def atomic_write(path: Path, body: BinaryIO) -> None:
+    # Stage next to the target so the final replace is a same-filesystem rename.
+    # The temp file is created 0600; give it the target's mode (or the umask default
+    # for a new file) so REPLACE/CREATE behave like an in-place write.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+    body.seek(0)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=path.parent, prefix=f".{path.name}.", suffix=".tmp") as tf:
+        try:
+            shutil.copyfileobj(body, tf)
+            os.chmod(tf.name, mode)
+        except BaseException:
+            tf.close()
+            os.unlink(tf.name)
+            raise
+        tmp = Path(tf.name)
+    tmp.replace(path)
+
+
+def same_content(path: Path, body: BinaryIO, size: int, chunk: int = 64 * 1024) -> bool:
+    """
+    True if path is a file whose bytes equal body (size checked first, then chunks).
+    """
+    try:
+        if not path.is_file() or path.stat().st_size != size:
+            return False
+        body.seek(0)
+        with path.open("rb") as f:
+            while True:
+                a = f.read(chunk)
+                if a != body.read(len(a) or 1):
+                    return False
+                if not a:
+                    return True
+    except OSError:
+        return False
+
+
+class BackupStore:
+    """
+    Content-addressed backups: each unique file version is stored once under
+    objects/<sha256[:2]>/<sha256>; each run writes a small manifest runs/<stamp>.json
+    mapping repo-relative paths to objects. Safe to call from worker threads.
+    """
+
+    def __init__(self, root: Path, backup_dir: Path) -> None:
+        self.root = root
+        self.backup_dir = backup_dir
+        self.files: Dict[str, Dict[str, object]] = {}
+        self.created: List[str] = []
+        self.new_objects = 0
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        return self.backup_dir / "objects" / digest[:2] / digest
+
+    def backup(self, p: Path) -> None:
+        if not (p.exists() and p.is_file()):
+            return
+        rel = p.relative_to(self.root).as_posix()
+        with self._lock:
+            if rel in self.files:
+                return  # keep the pre-run version
+
+        h = hashlib.sha256()
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        st = p.stat()
+
+        obj = self.object_path(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=obj.parent, suffix=".tmp") as tf:
+                with p.open("rb") as f:
+                    shutil.copyfileobj(f, tf)
+                tmp = Path(tf.name)
+            tmp.replace(obj)
+            with self._lock:
+                self.new_objects += 1
+
+        with self._lock:
+            self.files.setdefault(
+                rel, {"sha256": digest, "size": st.st_size, "mode": st.st_mode & 0o7777, "mtime": st.st_mtime}
+            )
+
+    def record_created(self, p: Path) -> None:
+        rel = p.relative_to(self.root).as_posix()
+        with self._lock:
+            if rel not in self.files and rel not in self.created:
+                self.created.append(rel)
+
+    def save_manifest(self, stamp: str, edits_file: str) -> Optional[Path]:
+        if not self.files and not self.created:
+            return None
+        runs = self.backup_dir / "runs"
+        runs.mkdir(parents=True, exist_ok=True)
+        out = runs / f"{stamp}.json"
+        n = 1
+        while out.exists():
+            out = runs / f"{stamp}_{n}.json"
+            n += 1
+        manifest = {
+            "root": self.root.as_posix(),
+            "edits_file": edits_file,
+            "created_local": stamp,
+            "files": dict(sorted(self.files.items())),
+            "created": sorted(self.created),
+        }
+        out.write_text(json.dumps(manifest, indent=1) + "\n", encoding="utf-8")
+        return out
+
+
+def load_runs(backup_dir: Path) -> List[Tuple[str, Dict]]:
+    """
+    (run id, manifest) pairs, oldest first.
+    """
+    runs_dir = backup_dir / "runs"
+    if not runs_dir.is_dir():
+        return []
+    out = []
+    for mf in sorted(runs_dir.glob("*.json")):
+        try:
+            out.append((mf.stem, json.loads(mf.read_text(encoding="utf-8"))))
+        except (OSError, ValueError):
+            print(f"[WARN] Unreadable manifest: {mf}")
+    return out
+
+
+def find_backup_root(start: Path, backup_dir: str) -> Path:
+    """
+    Nearest directory at or above start that holds backup_dir (apply may have been
+    run from anywhere inside ROOT). Falls back to start.
+    """
+    start = start.resolve()
+    for d in (start, *start.parents):
+        if (d / backup_dir).is_dir():
+            return d
+    return start
+
+
+def prune_empty_dirs(d: Path, root: Path) -> None:
+    """
+    Remove d and its parents while they are empty, stopping at root.
+    """
+    while d != root and root in d.parents:
+        try:
+            d.rmdir()
+        except OSError:
+            return
+        d = d.parent
+
+
+def parse_size(text: str) -> int:
+    import argparse
+
+    m = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$", text, re.IGNORECASE)
+    if not m:
+        raise argparse.ArgumentTypeError(f"Invalid size: {text}")
+    mult = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[m.group(2).upper()]
+    return int(float(m.group(1)) * mult)
+
+
+def backups_main(argv: List[str]) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="apply_edits.py backups", description="Inspect, restore and trim edit backups.")
+    ap.add_argument(
+        "--root",
+        default=None,
+        help="Repo root (default: nearest directory at or above CWD that holds --backup-dir).",
+    )
+    ap.add_argument("--backup-dir", default=".edits_backups", help="Backup dir under ROOT.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("list", help="List backup runs")
+
+    p_restore = sub.add_parser("restore", help="Restore files backed up by a run (rollback)")
+    p_restore.add_argument("run", help="Run id (see 'list') or 'latest'")
+    p_restore.add_argument("--path", action="append", default=[], help="Restore only this repo-relative path (repeatable)")
+    p_restore.add_argument(
+        "--remove-created",
+        action="store_true",
+        help="Also delete files the run created (CREATE and MOVE destinations), pruning emptied dirs",
+    )
+    p_restore.add_argument("--dry-run", action="store_true", help="Show what would be restored")
+
+    p_gc = sub.add_parser("gc", help="Drop oldest runs until the object store fits a size budget")
+    p_gc.add_argument("--max-size", type=parse_size, required=True, help="Size budget, e.g. 500M, 2G")
+    p_gc.add_argument("--keep-last", type=int, default=1, help="Never drop the newest N runs (default: 1)")
+    p_gc.add_argument("--dry-run", action="store_true", help="Show what would be removed")
+
+    args = ap.parse_args(argv)
+    root = Path(args.root).expanduser().resolve() if args.root else find_backup_root(Path.cwd(), args.backup_dir)
+    store = BackupStore(root, (root / args.backup_dir).resolve())
+    runs = load_runs(store.backup_dir)
+
+    if args.cmd == "list":
+        for run_id, m in runs:
+            print(f"{run_id}\tfiles={len(m.get('files', {}))}\tcreated={len(m.get('created', []))}\t{m.get('edits_file', '')}")
+        return 0
+
+    if args.cmd == "restore":
+        match = runs[-1:] if args.run == "latest" else [r for r in runs if r[0] == args.run]
+        if not match:
+            raise SystemExit(f"[FATAL] No such backup run: {args.run}")
+        run_id, manifest = match[0]
+        only = set(args.path)
+        tag = "DRYRUN" if args.dry_run else "OK"
+        # Paths the run created did not exist before it; with --remove-created they are
+        # removed rather than restored to an intermediate version.
+        created = set(manifest.get("created", [])) if args.remove_created else set()
+        touched: List[str] = []
+
+        for rel, meta in manifest.get("files", {}).items():
+            if (only and rel not in only) or rel in created:
+                continue
+            obj = store.object_path(str(meta["sha256"]))
+            if not obj.exists():
+                print(f"[ERROR] Missing object for {rel}: {obj}")
+                continue
+            target = root / rel
+            if not args.dry_run:
+                with obj.open("rb") as f:
+                    atomic_write(target, f)
+                os.chmod(target, int(meta["mode"]))
+                os.utime(target, (float(meta["mtime"]), float(meta["mtime"])))
+            touched.append(rel)
+            print(f"[{tag}] RESTORE {rel}")
+
+        for rel in sorted(created):
+            if only and rel not in only:
+                continue
+            target = root / rel
+            if target.is_file():
+                if not args.dry_run:
+                    target.unlink()
+                    prune_empty_dirs(target.parent, root)
+                touched.append(rel)
+                print(f"[{tag}] REMOVE {rel}")
+
+        # Undo staged renames/removals for the paths put back (resets them to HEAD).
+        if touched and is_git_repo(root) and not args.dry_run:
+            for chunk in chunked(touched):
+                git_output(["reset", "-q", "--", *chunk], cwd=root)
+        print(f"\nRestored from run {run_id}.")
+        return 0
+
+    if args.cmd == "gc":
+        # Each object is stat'ed once; dropping a run only decrements refcounts and
+        # subtracts objects no kept run references any more.
+        sizes: Dict[str, int] = {}
+
+        def size_of(digest: str) -> int:
+            if digest not in sizes:
+                try:
+                    sizes[digest] = store.object_path(digest).stat().st_size
+                except OSError:
+                    sizes[digest] = 0
+            return sizes[digest]
+
+        def digests(m: Dict) -> Set[str]:
+            return {str(meta["sha256"]) for meta in m.get("files", {}).values()}
+
+        refs: Dict[str, int] = {}
+        for _, m in runs:
+            for d in digests(m):
+                refs[d] = refs.get(d, 0) + 1
+        total = sum(size_of(d) for d in refs)
+
+        kept = list(runs)
+        dropped: List[str] = []
+        while len(kept) > max(0, args.keep_last) and total > args.max_size:
+            run_id, m = kept.pop(0)
+            dropped.append(run_id)
+            for d in digests(m):
+                refs[d] -= 1
+                if not refs[d]:
+                    del refs[d]
+                    total -= size_of(d)
+
+        objects_dir = store.backup_dir / "objects"
+        dead = [o for o in objects_dir.glob("*/*") if o.is_file() and o.name not in refs] if objects_dir.is_dir() else []
+        freed = sum(sizes[o.name] if o.name in sizes else o.stat().st_size for o in dead)
+
+        if not args.dry_run:
+            for run_id in dropped:
+                (store.backup_dir / "runs" / f"{run_id}.json").unlink()
+            for o in dead:
+                o.unlink()
+        tag = "DRYRUN" if args.dry_run else "OK"
+        print(f"[{tag}] Dropped {len(dropped)} run(s), removed {len(dead)} object(s), freed {freed} bytes")
+        print(f"[{tag}] Store now {total} bytes across {len(kept)} run(s)")
+        return 0
+
+    return 0
+
+
+RE_ROOT = re.compile(r"^ROOT:\s+(.+?)\s*$")
+RE_SCOPE = re.compile(r"^SCOPE:\s+(.+?)\s*$")
+RE_MKDIR = re.compile(r"^OP:\s+MKDIR\s+path=(.+?)\s*$")
+RE_DEL = re.compile(r"^OP:\s+DELETE\s+path=(.+?)\s*$")
+RE_MOVE = re.compile(r"^OP:\s+MOVE\s+from=(.+?)\s+to=(.+?)\s*$")
+RE_PATCH = re.compile(r"^OP:\s+PATCH\s+path=(.+?)\s*$")
+RE_HUNK = re.compile(r"^@@(?:\s*-(\d+)(?:,(\d+))?\s+\+\d+(?:,\d+)?\s*)?(?:@@.*)?$")
+
+RE_FILE = re.compile(r"^FILE:\s+(.+?)\s*$")
+RE_BEGIN = re.compile(r"^BEGIN\s*$")
+RE_END = re.compile(r"^END\s*$")
+
+
+def parse_hunks(path: str, body: List[str]) -> List[Hunk]:
+    """
+    Parse unified-diff-style hunks. "---"/"+++" file headers are ignored, bare "@@"
+    headers (no line numbers) are allowed, and an empty body line counts as an
+    empty context line (except at the end of a hunk, where it is usually just the
+    blank line before the next header or END).
+    """
+    hunks: List[Hunk] = []
+    for line in body:
+        m = RE_HUNK.match(line)
+        if m:
+            hunks.append(
+                Hunk(
+                    header=line.strip(),
+                    old_start=int(m.group(1)) if m.group(1) else None,
+                    old_count=int(m.group(2)) if m.group(2) else (1 if m.group(1) else None),
+                    lines=[],
+                )
+            )
+            continue
+        if not hunks:
+            if line.startswith(("---", "+++")) or not line.strip():
+                continue
+            raise ParseError(f"PATCH {path}: expected '@@' hunk header, got: {line}")
+        if line.startswith("\\"):
+            # "\ No newline at end of file" applies to the previous line
+            if hunks[-1].lines:
+                tag, text, _ = hunks[-1].lines[-1]
+                hunks[-1].lines[-1] = (tag, text, False)
+            continue
+        tag = line[:1] or " "
+        if tag not in (" ", "-", "+"):
+            raise ParseError(f"PATCH {path}: bad hunk line in {hunks[-1].header}: {line}")
+        hunks[-1].lines.append((tag, line[1:], True))
+
+    if not hunks:
+        raise ParseError(f"PATCH {path}: no hunks")
+    for h in hunks:
+        while h.lines and h.lines[-1] == (" ", "", True):
+            h.lines.pop()
+        if not any(tag != " " for tag, _, _ in h.lines):
+            raise ParseError(f"PATCH {path}: hunk {h.header} has no changes")
+    return hunks
+
+
+def find_hunk(lines: List[str], old: List[str], expected: int, lo: int) -> Tuple[int, bool]:
+    """
+    Position of old within lines[lo:], nearest to expected first. Tries an exact
+    match, then one ignoring trailing whitespace. Returns (index, fuzzy) or (-1, False).
+    """
+    n = len(old)
+    last = len(lines) - n
+    if last < lo:
+        return -1, False
+    expected = min(max(expected, lo), last)
+    order = [expected]
+    for d in range(1, max(expected - lo, last - expected) + 1):
+        if expected - d >= lo:
+            order.append(expected - d)
+        if expected + d <= last:
+            order.append(expected + d)
+
+    for fuzzy, norm in ((False, lambda t: t), (True, lambda t: t.rstrip())):
+        want = [norm(t) for t in old]
+        for pos in order:
+            if all(norm(lines[pos + k].rstrip("\r\n")) == want[k] for k in range(n)):
+                return pos, fuzzy
+    return -1, False
+
+
+def first_mismatch(lines: List[str], old: List[str], expected: int, lo: int) -> str:
+    """
+    Describe the first context/removed line that does not match at the expected position.
+    """
+    at = min(max(expected, lo), len(lines))
+    for k, want in enumerate(old):
+        if at + k >= len(lines):
+            return f"expected {want!r} at line {at + k + 1}, past end of file"
+        got = lines[at + k].rstrip("\r\n")
+        if got.rstrip() != want.rstrip():
+            return f"line {at + k + 1} is {got!r}, expected {want!r}"
+    return f"no match at or after line {lo + 1}"
+
+
+def apply_hunks(text: str, hunks: List[Hunk]) -> Tuple[str, List[str]]:
+    """
+    Apply hunks in order against text, allowing each to drift from its stated line.
+    Returns (new_text, notes about offsets/fuzz); raises PatchConflict if a hunk's
+    context/removed lines cannot be found.
+    """
+    lines = text.splitlines(keepends=True)
+    eol = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+    out: List[str] = []
+    cursor = 0  # next unconsumed line in `lines`
+    delta = 0  # how far earlier hunks were found from their stated (original-file) lines
+    notes: List[str] = []
+
+    for n, h in enumerate(hunks, start=1):
+        old = [t for tag, t, _ in h.lines if tag != "+"]
+        if h.old_start is None:
+            expected = cursor
+        elif h.old_count == 0:
+            expected = h.old_start + delta  # empty old range: insert after line old_start
+        else:
+            expected = max(h.old_start - 1, 0) + delta
+        if not old:
+            pos, fuzzy = min(max(expected, cursor), len(lines)), False
+        else:
+            pos, fuzzy = find_hunk(lines, old, expected, cursor)
+        if pos < 0:
+            raise PatchConflict(f"hunk #{n} {h.header}: context not found ({first_mismatch(lines, old, expected, cursor)})")
+        if h.old_start is not None and pos != expected:
+            notes.append(f"#{n} offset {pos - expected:+d}" + (" (whitespace fuzz)" if fuzzy else ""))
+        elif fuzzy:
+            notes.append(f"#{n} whitespace fuzz")
+
+        out.extend(lines[cursor:pos])
+        k = pos
+        for tag, t, has_eol in h.lines:
+            if tag == " ":
+                out.append(lines[k])
+                k += 1
+            elif tag == "-":
+                k += 1
+            else:
+                if out and not out[-1].endswith("\n"):
+                    out[-1] += eol  # was the file's unterminated last line
+                out.append(t + (eol if has_eol else ""))
+        # old_start counts lines of the original file, like `lines`, so only the
+        # drift carries over (not the lines this hunk added/removed).
+        if h.old_start is not None:
+            delta += pos - expected
+        cursor = k
+
+    out.extend(lines[cursor:])
+    return "".join(out), notes
+
+
+def discard_blocks(edits: Iterable[Edit]) -> None:
+    for e in edits:
+        if isinstance(e, FileBlock):
+            e.discard()
+
+
+def parse_edits(fp: TextIO) -> Tuple[Path, str, Iterator[Edit]]:
+    """
+    Streaming EDITS v1 parser.
+
+    Reads and validates the header and ROOT/SCOPE eagerly, then returns an iterator
+    that yields ops and FILE blocks one at a time. FILE bodies stay in memory while
+    small and under SPOOL_MEMORY_BUDGET, otherwise they spill to closed named temp
+    files, so memory and open file descriptors stay bounded regardless of the size
+    of the edit set. Call FileBlock.discard() on blocks that are no longer needed.
+    """
+    first = fp.readline()
+    if first.strip() != HEADER:
+        raise ParseError(f"First line must be exactly: {HEADER}")
+
+    root: Optional[Path] = None
+    scope: Optional[str] = None
+
+    while root is None or scope is None:
+        raw = fp.readline()
+        if raw == "":
+            break
+        s = raw.strip()
+        if s == "":
+            continue
+
+        m = RE_ROOT.match(s)
+        if m:
+            root = Path(m.group(1)).expanduser().resolve()
+            continue
+
+        m = RE_SCOPE.match(s)
+        if m:
+            scope = m.group(1).strip()
+            continue
+
+        raise ParseError(f"ROOT: and SCOPE: must come before any op, got: {s}")
+
+    if root is None:
+        raise ParseError("Missing ROOT:")
+    if scope is None:
+        raise ParseError("Missing SCOPE:")
+
+    return root, scope, _iter_edits(fp)
+
+
+def _iter_edits(fp: TextIO) -> Iterator[Edit]:
+    in_memory = 0
+
+    def read_block(path: str) -> FileBlock:
+        nonlocal in_memory
+        chunks: List[bytes] = []
+        spill: Optional[BinaryIO] = None
+        size = 0
+        try:
+            for raw in fp:
+                if RE_END.match(raw.strip()):
+                    if spill is None:
+                        in_memory += size
+                        return FileBlock(path=path, size=size, data=b"".join(chunks))
+                    spill.close()
+                    return FileBlock(path=path, size=size, spill=spill.name)
+                data = raw.encode("utf-8")
+                size += len(data)
+                if spill is None:
+                    chunks.append(data)
+                    if size > SPOOL_MAX_BYTES or in_memory + size > SPOOL_MEMORY_BUDGET:
+                        spill = tempfile.NamedTemporaryFile("wb", delete=False, prefix="edits_", suffix=".body")
+                        spill.write(b"".join(chunks))
+                        chunks = []
+                else:
+                    spill.write(data)
+            raise ParseError("Missing END for FILE block")
+        except BaseException:
+            if spill is not None:
+                spill.close()
+                os.unlink(spill.name)
+            raise
+
+    for raw in fp:
+        s = raw.strip()
+        if s == "":
+            continue
+
+        m = RE_MKDIR.match(s)
+        if m:
+            yield OpMkdir(path=m.group(1).strip())
+            continue
+
+        m = RE_DEL.match(s)
+        if m:
+            yield OpDelete(path=m.group(1).strip())
+            continue
+
+        m = RE_MOVE.match(s)
+        if m:
+            yield OpMove(src=m.group(1).strip(), dst=m.group(2).strip())
+            continue
+
+        m = RE_PATCH.match(s)
+        if m:
+            path = m.group(1).strip()
+            if not RE_BEGIN.match(fp.readline().strip()):
+                raise ParseError(f"Missing BEGIN for PATCH: {path}")
+            body: List[str] = []
+            for raw in fp:
+                if RE_END.match(raw.strip()):
+                    break
+                body.append(raw.rstrip("\n"))
+            else:
+                raise ParseError(f"Missing END for PATCH: {path}")
+            yield OpPatch(path=path, hunks=parse_hunks(path, body))
+            continue
+
+        m = RE_FILE.match(s)
+        if m:
+            path = m.group(1).strip()
+            nxt = fp.readline()
+            if not RE_BEGIN.match(nxt.strip()):
+                raise ParseError(f"Missing BEGIN for FILE: {path}")
+            yield read_block(path)
+            continue
+
+        if RE_ROOT.match(s) or RE_SCOPE.match(s):
+            raise ParseError(f"ROOT:/SCOPE: may only appear once, before any op: {s}")
+
+        raise ParseError(f"Unrecognized line: {s}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["backups"]:
+        return backups_main(argv[1:])
+
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Apply EDITS v1 to a repo safely.")
+    ap.add_argument("edits_file", help="Path to EDITS v1 file (AI output).")
+    ap.add_argument("--dry-run", action="store_true", help="Validate only, do not write.")
+    ap.add_argument("--no-git", action="store_true", help="Do not use git mv/rm even if repo is git.")
+    ap.add_argument("--backup-dir", default=".edits_backups", help="Backup dir under ROOT.")
+    ap.add_argument("--allow-outside-scope", action="store_true", help="Allow edits anywhere under ROOT, not just SCOPE.")
+    ap.add_argument("--force-delete-dir", action="store_true", help="Allow deleting non-empty directories (DANGEROUS).")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="Parallel file writes (default: min(8, CPUs)).",
+    )
+    args = ap.parse_args(argv)
+    try:
+        return report_results(iter_apply_edits(**vars(args)))
+    except (ParseError, ApplyError) as e:
+        raise SystemExit(f"[FATAL] {e}")
+
+
+def report_results(results: Iterable[OpResult]) -> int:
+    """Print op results as they arrive, then the run summary. Returns the CLI exit code."""
+    skipped = conflicts = 0
+    backup: Optional[OpResult] = None
+    for r in results:
+        if r.action == "BACKUP":
+            backup = r
+            continue
+        print(r)
+        skipped += r.status == "unchanged"
+        conflicts += r.status == "conflict"
+
+    print("\nDone.")
+    if skipped:
+        print(f"Unchanged (skipped): {skipped} file(s)")
+    if conflicts:
+        print(f"[ERROR] PATCH conflicts (those patches were not applied): {conflicts}")
+    if backup:
+        print(backup)
+    return 1 if conflicts else 0
+
+
+def iter_apply_edits(
+    edits_file: str,
+    *,
+    dry_run: bool = False,
+    no_git: bool = False,
+    backup_dir: str = ".edits_backups",
+    allow_outside_scope: bool = False,
+    force_delete_dir: bool = False,
+    jobs: Optional[int] = None,
+    cwd: Optional[Union[str, Path]] = None,
+) -> Iterator[OpResult]:
+    """
+    Apply an EDITS v1 file in-process (same behavior as the CLI, nothing printed),
+    yielding one OpResult per op as it completes. FILE/PATCH results arrive together
+    once that phase finishes. A real run ends with a BACKUP result naming the manifest.
+    PATCH conflicts are reported (status "conflict"), not raised.
+
+    The "run from inside ROOT" check uses cwd (default: the process CWD), so callers
+    can pass the repo root instead of chdir-ing. Raises ParseError for malformed or
+    out-of-ROOT/SCOPE edits and ApplyError for refused operations; results yielded
+    before that have already been applied (and backed up).
+    """
+    jobs = jobs or min(8, os.cpu_count() or 1)
+
+    with open(edits_file, "r", encoding="utf-8") as fp:
+        root, scope_rel, edits = parse_edits(fp)
+
+        cwd = Path(cwd if cwd is not None else os.getcwd()).expanduser().resolve()
+        try:
+            cwd.relative_to(root)
+        except ValueError:
+            raise ApplyError(f"Run from inside ROOT.\n  ROOT: {root}\n  CWD:  {cwd}")
+
+        # Ops are applied in phases (MKDIR, MOVE, FILE, DELETE), so the whole file is
+        # validated before anything is touched. Only the small op records are kept;
+        # FILE bodies stay in memory or in spill files.
+        mkdirs: List[OpMkdir] = []
+        deletes: List[OpDelete] = []
+        moves: List[OpMove] = []
+        file_blocks: List[Union[FileBlock, OpPatch]] = []
+        try:
+            for e in edits:
+                if isinstance(e, OpMkdir):
+                    mkdirs.append(e)
+                elif isinstance(e, OpDelete):
+                    deletes.append(e)
+                elif isinstance(e, OpMove):
+                    moves.append(e)
+                else:
+                    file_blocks.append(e)
+        except BaseException:
+            discard_blocks(file_blocks)
+            raise
+
+    use_git = (not no_git) and is_git_repo(root)
+    backup_root = (root / backup_dir).resolve()
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    store = BackupStore(root, backup_root)
+
+    def check_path(abs_str: str) -> Path:
+        p = Path(abs_str).expanduser().resolve()
+        ensure_under_root(root, p)
+        if not allow_outside_scope:
+            ensure_in_scope(root, scope_rel, p)
+        return p
+
+    def backup_if_exists(p: Path) -> None:
+        store.backup(p)
+
+    # Save the backup manifest even if a later op fails, so the run can be rolled back.
+    manifest: Optional[Path] = None
+    try:
+        # 1) MKDIR
+        for op in mkdirs:
+            p = check_path(op.path)
+            if dry_run:
+                yield OpResult("MKDIR", p, "dry-run", line=f"[DRYRUN] MKDIR {p}")
+            else:
+                p.mkdir(parents=True, exist_ok=True)
+                yield OpResult("MKDIR", p, "ok", line=f"[OK] MKDIR {p}")
+
+        # 2) MOVE
+        def git_moved(src: Path, dst: Path) -> OpResult:
+            src_rel = src.relative_to(root).as_posix()
+            dst_rel = dst.relative_to(root).as_posix()
+            return OpResult("MOVE", dst, "ok", "git", src, f"[GIT] mv {src_rel} -> {dst_rel}")
+
+        def move_one(src: Path, dst: Path) -> OpResult:
+            # Prefer git mv for proper history
+            if use_git:
+                # paths passed to git should be repo-relative
+                src_rel = src.relative_to(root).as_posix()
+                dst_rel = dst.relative_to(root).as_posix()
+                if run_git(["mv", src_rel, dst_rel], cwd=root):
+                    return git_moved(src, dst)
+
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), str(dst))
+            return OpResult("MOVE", dst, "ok", "fs", src, f"[FS] mv {src} -> {dst}")
+
+        move_pairs = [(check_path(op.src), check_path(op.dst)) for op in moves]
+        if dry_run:
+            for src, dst in move_pairs:
+                yield OpResult("MOVE", dst, "dry-run", src=src, line=f"[DRYRUN] MOVE {src} -> {dst}")
+        else:
+            def note_move(src: Path, dst: Path) -> None:
+                # Called right before a move runs: back up what it takes away or
+                # overwrites, and record destination files that did not exist before,
+                # so `backups restore --remove-created` can undo it.
+                target = dst / src.name if dst.is_dir() else dst
+                if src.is_file():
+                    pairs = [(src, target)]
+                elif src.is_dir():
+                    pairs = [(f, target / f.relative_to(src)) for f in src.rglob("*") if f.is_file()]
+                else:
+                    pairs = []
+                for f, t in pairs:
+                    backup_if_exists(f)
+                    if t.exists():
+                        backup_if_exists(t)
+                    else:
+                        store.record_created(t)
+
+            # Independent moves share one index update; chained/overlapping ones
+            # (a -> b, b -> c) run afterwards, in order, one by one.
+            dependent = dependent_moves(
+                [(s.relative_to(root).as_posix(), d.relative_to(root).as_posix()) for s, d in move_pairs]
+            )
+            free = [i for i in range(len(move_pairs)) if i not in dependent]
+            batched: Set[int] = set()
+            for i in free:
+                note_move(*move_pairs[i])
+            if use_git and free:
+                res = git_batch_move(root, [move_pairs[i] for i in free])
+                if res is not None:
+                    batched = {i for i, ok in zip(free, res) if ok}
+
+            for i, (src, dst) in enumerate(move_pairs):
+                if i in batched:
+                    yield git_moved(src, dst)
+                elif i not in dependent:
+                    yield move_one(src, dst)
+            for i in sorted(dependent):
+                note_move(*move_pairs[i])
+                yield move_one(*move_pairs[i])
+
+        # 3) FILE create/replace + PATCH
+        # Blocks for the same path run in order within one task; distinct paths run
+        # concurrently. Byte-identical content is skipped (no backup, no write).
+        by_path: Dict[Path, List[int]] = {}
+        for i, fb in enumerate(file_blocks):
+            by_path.setdefault(check_path(fb.path), []).append(i)
+
+        file_results: List[Optional[OpResult]] = [None] * len(file_blocks)
+
+        def write_path(p: Path, idxs: List[int]) -> None:
+            for i in idxs:
+                fb = file_blocks[i]
+                note = ""
+                if isinstance(fb, OpPatch):
+                    try:
+                        if not p.is_file():
+                            raise PatchConflict("file does not exist")
+                        with open(p, "r", encoding="utf-8", newline="") as f:
+                            new_text, notes = apply_hunks(f.read(), fb.hunks)
+                    except (PatchConflict, UnicodeDecodeError) as e:
+                        file_results[i] = OpResult("PATCH", p, "conflict", str(e), line=f"[CONFLICT] PATCH {p}: {e}")
+                        continue
+                    data = new_text.encode("utf-8")
+                    body: BinaryIO = io.BytesIO(data)
+                    size = len(data)
+                    action = "PATCH"
+                    note = f"hunks={len(fb.hunks)}{'; ' + ', '.join(notes) if notes else ''}"
+                else:
+                    body, size = fb.open(), fb.size
+                    action = "CREATE" if not p.exists() else "REPLACE"
+                    if dry_run:
+                        note = f"bytes={size}"
+
+                try:
+                    if same_content(p, body, size):
+                        tag = "DRYRUN" if dry_run else "OK"
+                        file_results[i] = OpResult(action, p, "unchanged", line=f"[{tag}] SKIP {p} (unchanged)")
+                        continue
+
+                    suffix = f" ({note})" if note else ""
+                    if dry_run:
+                        file_results[i] = OpResult(action, p, "dry-run", note, line=f"[DRYRUN] {action} {p}{suffix}")
+                        continue
+
+                    backup_if_exists(p)
+                    atomic_write(p, body)
+                    if action == "CREATE":
+                        store.record_created(p)
+                    file_results[i] = OpResult(action, p, "ok", note, line=f"[OK] {action} {p}{suffix}")
+                finally:
+                    body.close()
+                    if isinstance(fb, FileBlock):
+                        fb.discard()
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = [pool.submit(write_path, p, idxs) for p, idxs in by_path.items()]
+            for fut in futures:
+                fut.result()
+
+        for r in file_results:
+            if r is not None:
+                yield r
+
+        # 4) DELETE
+        # Files first (one batched `git rm` for all tracked ones), then directories in
+        # order, so "delete files, then their now-empty folder" keeps working.
+        delete_paths = [check_path(op.path) for op in deletes]
+
+        if dry_run:
+            for p in delete_paths:
+                yield OpResult("DELETE", p, "dry-run", line=f"[DRYRUN] DELETE {p}")
+        else:
+            files = [p for p in delete_paths if p.is_file()]
+            for p in files:
+                backup_if_exists(p)
+
+            tracked: Set[str] = set()
+            if use_git and files:
+                file_rels = [p.relative_to(root).as_posix() for p in files]
+                entries = git_index_entries(root, file_rels)
+                if entries is not None:
+                    to_rm = [r for r in file_rels if r in entries]
+                    if to_rm and git_batch_rm(root, to_rm):
+                        tracked = set(to_rm)
+
+            for p in delete_paths:
+                if p in files:
+                    rel = p.relative_to(root).as_posix()
+                    if rel in tracked:
+                        yield OpResult("DELETE", p, "ok", "git", line=f"[GIT] rm {rel}")
+                        continue
+                    if not p.exists():
+                        yield OpResult("DELETE", p, "missing", line=f"[OK] DELETE {p} (already missing)")
+                        continue
+                    if use_git and run_git(["rm", "-f", rel], cwd=root):
+                        yield OpResult("DELETE", p, "ok", "git", line=f"[GIT] rm {rel}")
+                        continue
+                    p.unlink()
+                    yield OpResult("DELETE", p, "ok", "fs", line=f"[FS] rm {p}")
+                    continue
+
+                if not p.exists():
+                    yield OpResult("DELETE", p, "missing", line=f"[OK] DELETE {p} (already missing)")
+                    continue
+
+                if p.is_dir():
+                    # Prefer git rm -r if allowed
+                    if use_git and force_delete_dir:
+                        rel = p.relative_to(root).as_posix()
+                        if run_git(["rm", "-rf", rel], cwd=root):
+                            yield OpResult("DELETE", p, "ok", "git", line=f"[GIT] rm -r {rel}")
+                            continue
+                    # Filesystem delete
+                    if force_delete_dir:
+                        shutil.rmtree(p)
+                        yield OpResult("DELETE", p, "ok", "rmtree", line=f"[FS] rmtree {p}")
+                    else:
+                        # only delete if empty
+                        try:
+                            p.rmdir()
+                            yield OpResult("DELETE", p, "ok", "rmdir", line=f"[FS] rmdir {p}")
+                        except OSError:
+                            raise ApplyError(f"Refusing to delete non-empty dir without --force-delete-dir: {p}")
+    finally:
+        discard_blocks(file_blocks)
+        if not dry_run:
+            manifest = store.save_manifest(stamp, edits_file)
+
+    if manifest:
+        counts = f"{len(store.files)} file(s), {store.new_objects} new object(s)"
+        yield OpResult("BACKUP", manifest, "ok", counts, line=f"Backups: {counts}; manifest: {manifest}")
+
+
+
+def apply_edits_file(edits_file: str, **options) -> List[OpResult]:
+    """list(iter_apply_edits(edits_file, **options)): apply the whole file, return every result."""
+    return list(iter_apply_edits(edits_file, **options))
@@ -0,0 +1,647 @@
+"""
+snapshot_kit.reader — Utilities for SNAPSHOT v1 concatenated repo dumps.
+CLI: scripts/snapshot-tools.py or `python3 -m snapshot_kit tools`.
+
+Snapshot format (simplified):
+  SNAPSHOT v1
+  ROOT: ...
+  SCOPE: ...
+  CREATED_UTC: ...
+  FILE: /abs/path/to/file
+  BEGIN
+  <contents>
+  END
+  FILE: ...
+
+Works on macOS/Linux. Python 3.9+ recommended.
+"""
+
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import re
+
+# Heavier modules (argparse, difflib, pathlib, typing) are imported where used so
+# `list`/`get` and in-process callers don't pay for them.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Generator, Iterator, List, Optional, Tuple
+
+
+class FileBlock:
+    """
+    One FILE/BEGIN/END block, addressed by byte offsets into the snapshot.
+
+    Content is decoded lazily from a shared read-only mmap, so consumers that only
+    need the path (list), a few lines (get --head/--tail) or a line scan (search)
+    never materialize the whole file body.
+    """
+
+    __slots__ = ("path", "start", "end", "start_line_in_snapshot", "line_count", "line_map", "_buf")
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        start_line_in_snapshot: int,
+        line_count: int,
+        buf: "mmap.mmap",
+        line_map: Optional[str] = None,
+    ) -> None:
+        self.path = path                                  # absolute path as stored in snapshot
+        self.start = start                                # byte offset of first content byte
+        self.end = end                                    # byte offset just past the content
+        self.start_line_in_snapshot = start_line_in_snapshot  # 1-indexed line of first content line
+        self.line_count = line_count                      # number of content lines
+        self.line_map = line_map                          # LINEMAP of a compacted file, if any
+        self._buf = buf
+
+    def __repr__(self) -> str:
+        return f"FileBlock(path={self.path!r}, bytes={self.end - self.start}, lines={self.line_count})"
+
+    def orig_line(self, n: int) -> int:
+        """Line number in the original file for content line n (differs only for compacted files)."""
+        if not self.line_map:
+            return n
+        from .compact import decode_line_map, orig_line
+
+        return orig_line(decode_line_map(self.line_map), n)
+
+    def raw(self) -> bytes:
+        return self._buf[self.start:self.end]
+
+    @property
+    def content(self) -> str:
+        """Full file contents between BEGIN/END (newline-terminated, LF line endings)."""
+        text = self.raw().decode("utf-8", errors="replace")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if text and not text.endswith("\n"):
+            text += "\n"
+        return text
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield content lines (without line endings), decoding one line at a time."""
+        buf = self._buf
+        pos = self.start
+        while pos < self.end:
+            nl = buf.find(b"\n", pos, self.end)
+            stop = self.end if nl == -1 else nl
+            yield buf[pos:stop].rstrip(b"\r").decode("utf-8", errors="replace")
+            pos = stop + 1
+
+    def lines(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Content lines [start:stop) (0-indexed), scanning only up to stop."""
+        return list(itertools.islice(self.iter_lines(), start, stop))
+
+    def head(self, n: int) -> List[str]:
+        return self.lines(0, n)
+
+    def tail(self, n: int) -> List[str]:
+        """Last n lines, found by scanning backwards from the end of the block."""
+        if n <= 0 or self.start >= self.end:
+            return []
+        buf = self._buf
+        pos = self.end
+        if buf[pos - 1:pos] == b"\n":
+            pos -= 1
+        cut = pos
+        for _ in range(n):
+            cut = buf.rfind(b"\n", self.start, cut)
+            if cut == -1:
+                break
+        first = self.start if cut == -1 else cut + 1
+        chunk = buf[first:pos].decode("utf-8", errors="replace")
+        return [ln.rstrip("\r") for ln in chunk.split("\n")]
+
+
+SNAPSHOT_HEADER_RE = re.compile(r"^SNAPSHOT v1\s*$")
+FILE_RE = re.compile(r"^FILE:\s+(.*)\s*$")
+BEGIN_RE = re.compile(r"^BEGIN\s*$")
+END_RE = re.compile(r"^END\s*$")
+
+
+def iter_file_blocks(snapshot_path: str) -> Generator[FileBlock, None, None]:
+    """
+    Stream-parse the snapshot file into FileBlocks without loading everything into memory.
+    Only FILE/BEGIN/END marker lines are decoded; block bodies stay as byte ranges.
+    """
+    with open(snapshot_path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+
+        line_no = 0
+        offset = 0
+        current_path: Optional[str] = None
+        line_map: Optional[str] = None
+        in_block = False
+        content_start = 0
+        content_start_line = 0
+
+        for raw in f:
+            line_no += 1
+            line_start = offset
+            offset += len(raw)
+
+            if in_block:
+                if raw[:3] == b"END" and END_RE.match(raw.decode("utf-8", errors="replace").rstrip("\r\n")):
+                    yield FileBlock(
+                        path=current_path or "",
+                        start=content_start,
+                        end=line_start,
+                        start_line_in_snapshot=content_start_line,
+                        line_count=line_no - content_start_line,
+                        buf=buf,
+                        line_map=line_map,
+                    )
+                    # reset
+                    current_path = None
+                    line_map = None
+                    in_block = False
+                continue
+
+            if raw[:5] == b"FILE:":
+                m = FILE_RE.match(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+                if m:
+                    current_path = m.group(1)
+                    line_map = None
+                    continue
+
+            if current_path is not None and raw[:8] == b"LINEMAP:":
+                line_map = raw[8:].decode("utf-8", errors="replace").strip()
+                continue
+
+            if (
+                current_path is not None
+                and raw[:5] == b"BEGIN"
+                and BEGIN_RE.match(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+            ):
+                in_block = True
+                content_start = offset
+                content_start_line = line_no + 1
+
+        # If file ends while in_block, emit what we have (best effort)
+        if in_block and current_path:
+            yield FileBlock(
+                path=current_path,
+                start=content_start,
+                end=offset,
+                start_line_in_snapshot=content_start_line,
+                line_count=line_no - content_start_line + 1,
+                buf=buf,
+                line_map=line_map,
+            )
+
+
+def list_files(snapshot_path: str) -> List[str]:
+    return [fb.path for fb in iter_file_blocks(snapshot_path)]
+
+
+def get_file(snapshot_path: str, file_path: str) -> Optional[FileBlock]:
+    """
+    Exact match on the FILE: absolute path stored in snapshot.
+    """
+    for fb in iter_file_blocks(snapshot_path):
+        if fb.path == file_path:
+            return fb
+    return None
+
+
+def search_regex(
+    snapshot_path: str,
+    pattern: str,
+    context: int = 3,
+    ignore_case: bool = False,
+    max_hits_per_file: int = 200,
+) -> List[str]:
+    """
+    Regex search inside file contents. Returns printable strings grouped by file.
+    Raises ValueError for an invalid pattern.
+    """
+    flags = re.MULTILINE
+    if ignore_case:
+        flags |= re.IGNORECASE
+
+    try:
+        rx = re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}") from e
+
+    out: List[str] = []
+    for fb in iter_file_blocks(snapshot_path):
+        # Pass 1: find hit line numbers without keeping any lines around.
+        hits: List[int] = []
+        for idx, line in enumerate(fb.iter_lines(), start=1):
+            if rx.search(line):
+                hits.append(idx)
+                if len(hits) >= max_hits_per_file:
+                    break
+
+        if not hits:
+            continue
+
+        out.append(f"FILE: {fb.path}")
+        out.append(f"(showing context={context}, hits={len(hits)})")
+
+        # Merge overlapping context windows
+        merged: List[Tuple[int, int, int]] = []
+        for h in hits:
+            start = max(1, h - context)
+            end = min(fb.line_count, h + context)
+            if not merged:
+                merged.append((start, end, h))
+            else:
+                prev_start, prev_end, prev_h = merged[-1]
+                if start <= prev_end:
+                    merged[-1] = (prev_start, max(prev_end, end), h)
+                else:
+                    merged.append((start, end, h))
+
+        # Pass 2: decode only up to the last window and keep only window lines.
+        hit_set = set(hits)
+        windows = iter(merged)
+        start, end, _ = next(windows)
+        for ln, line in enumerate(fb.iter_lines(), start=1):
+            if ln < start:
+                continue
+            prefix = ">>" if ln in hit_set else "  "
+            out.append(f"{prefix} {fb.orig_line(ln):5d} | {line}")
+            if ln == end:
+                out.append("")
+                nxt = next(windows, None)
+                if nxt is None:
+                    break
+                start, end, _ = nxt
+
+        out.append("-" * 80)
+
+    return out
+
+
+def fuzzy_find_files(
+    snapshot_path: str,
+    query: str,
+    limit: int = 20,
+) -> List[Tuple[float, str]]:
+    """
+    Fuzzy-ish file path search:
+    - exact substring matches first (score 1.0)
+    - then similarity on basename and full path
+    Uses stdlib difflib (no deps).
+    """
+    import difflib
+
+    q = query.strip().lower()
+    if not q:
+        return []
+
+    results: List[Tuple[float, str]] = []
+    for p in list_files(snapshot_path):
+        pl = p.lower()
+        if q in pl:
+            results.append((1.0, p))
+            continue
+
+        base = os.path.basename(pl)
+        s1 = difflib.SequenceMatcher(None, q, base).ratio()
+        s2 = difflib.SequenceMatcher(None, q, pl).ratio()
+        score = max(s1, s2) * 0.95  # keep below true substring matches
+        if score >= 0.55:
+            results.append((score, p))
+
+    results.sort(key=lambda x: x[0], reverse=True)
+    return results[:limit]
+
+
+def export_snapshot(snapshot_path: str, out_dir: str, strip_prefix: Optional[str] = None) -> int:
+    """
+    Write snapshot files out to a folder so you can use rg/IDE normally.
+    strip_prefix: if provided, this absolute prefix will be removed from FILE: paths.
+                  Example: "/Users/pavelkulikou/Projects/my-gym/gym-app/"
+    """
+    from pathlib import Path
+
+    out_root = Path(out_dir)
+    out_root.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    for fb in iter_file_blocks(snapshot_path):
+        rel = fb.path
+        if strip_prefix and rel.startswith(strip_prefix):
+            rel = rel[len(strip_prefix):]
+        rel = rel.lstrip("/")
+
+        target = out_root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(fb.content, encoding="utf-8")
+        count += 1
+
+    return count
+
+
+def apply_edits_to_snapshot(
+    snapshot_path: str,
+    edits_path: str,
+    out_path: str,
+) -> Dict[str, int]:
+    """
+    Produce an updated snapshot from an existing SNAPSHOT v1 and an EDITS v1 file,
+    without rescanning the repo. Untouched blocks are copied as raw bytes; only
+    replaced/patched/new files are written from the edits. Ops follow apply_edits.py
+    phase order (MKDIR, MOVE, FILE/PATCH, DELETE); MKDIR is a no-op here.
+    Raises edits.PatchConflict on PATCH conflicts and edits.ParseError on malformed
+    input or mismatched ROOT; nothing is written in either case.
+    """
+    import posixpath
+    import tempfile
+    from datetime import datetime, timezone
+    from pathlib import Path
+
+    from . import edits as ae
+
+    blocks = list(iter_file_blocks(snapshot_path))
+
+    # Header: everything before the first FILE: line.
+    header_lines: List[str] = []
+    with open(snapshot_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for line in f:
+            if FILE_RE.match(line.rstrip("\r\n")):
+                break
+            header_lines.append(line)
+    header = "".join(header_lines)
+    m = re.search(r"^ROOT:\s+(.+?)\s*$", header, re.MULTILINE)
+    if not m:
+        raise ae.ParseError(f"Not a SNAPSHOT v1 file (no ROOT:): {snapshot_path}")
+    snap_root = m.group(1)
+
+    with open(edits_path, "r", encoding="utf-8") as fp:
+        root, _scope, edits = ae.parse_edits(fp)
+        if root.as_posix() != Path(snap_root).expanduser().resolve().as_posix():
+            raise ae.ParseError(f"EDITS ROOT does not match snapshot ROOT:\n  EDITS:    {root}\n  SNAPSHOT: {snap_root}")
+
+        def norm(p: str) -> str:
+            n = posixpath.normpath(p)
+            if not (n + "/").startswith(root.as_posix().rstrip("/") + "/"):
+                raise ae.ParseError(f"Refusing path outside ROOT: {p}")
+            return n
+
+        def under(path: str, prefix: str) -> bool:
+            return path == prefix or path.startswith(prefix + "/")
+
+        moves: List[Tuple[str, str]] = []
+        deletes: List[str] = []
+        writes: Dict[str, list] = {}  # final path -> FileBlock/OpPatch in order
+        parsed: list = []
+        try:
+            for e in edits:
+                parsed.append(e)
+                if isinstance(e, ae.OpMove):
+                    moves.append((norm(e.src), norm(e.dst)))
+                elif isinstance(e, ae.OpDelete):
+                    deletes.append(norm(e.path))
+                elif isinstance(e, (ae.FileBlock, ae.OpPatch)):
+                    writes.setdefault(norm(e.path), []).append(e)
+        except BaseException:
+            ae.discard_blocks(parsed)
+            raise
+
+    stats = {"kept": 0, "moved": 0, "replaced": 0, "patched": 0, "added": 0, "deleted": 0}
+
+    # Current path of every existing block; moves apply in order, as on disk.
+    paths = [posixpath.normpath(fb.path) for fb in blocks]
+    moved_idx = set()
+    for src, dst in moves:
+        # Like git mv / shutil.move: moving onto an existing directory puts the
+        # source inside it (edits.note_move makes the same call).
+        if not under(dst, src) and any(p.startswith(dst + "/") for p in paths):
+            dst = posixpath.join(dst, posixpath.basename(src))
+        for idx, path in enumerate(paths):
+            if under(path, src):
+                paths[idx] = dst + path[len(src):]
+                moved_idx.add(idx)
+
+    final: Dict[str, int] = {}
+    moved_paths = set()
+    for idx, path in enumerate(paths):
+        if any(under(path, d) for d in deletes):
+            stats["deleted"] += 1
+            continue
+        if path in final and idx not in moved_idx:
+            continue  # a moved file landed on this path and replaces it
+        final[path] = idx
+        if idx in moved_idx:
+            moved_paths.add(path)
+
+    # Resolve new contents for written paths (PATCH sees earlier FILE/PATCH results).
+    new_content: Dict[str, bytes] = {}
+    conflicts: List[str] = []
+    for path, ops in writes.items():
+        if any(under(path, d) for d in deletes):
+            ae.discard_blocks(ops)
+            continue
+        data: Optional[bytes] = blocks[final[path]].raw() if path in final else None
+        for op in ops:
+            if isinstance(op, ae.FileBlock):
+                with op.open() as f:
+                    data = f.read()
+                op.discard()
+                continue
+            if data is None:
+                conflicts.append(f"{path}: file does not exist in snapshot")
+                break
+            try:
+                text, _notes = ae.apply_hunks(data.decode("utf-8", errors="replace"), op.hunks)
+            except ae.PatchConflict as ex:
+                conflicts.append(f"{path}: {ex}")
+                break
+            data = text.encode("utf-8")
+        else:
+            if path in final:
+                stats["patched" if all(isinstance(o, ae.OpPatch) for o in ops) else "replaced"] += 1
+            else:
+                stats["added"] += 1
+            new_content[path] = data or b""
+        ae.discard_blocks(ops)  # blocks after a conflicting PATCH
+
+    if conflicts:
+        raise ae.PatchConflict("PATCH conflicts, snapshot not written:\n  " + "\n  ".join(conflicts))
+
+    order = sorted(set(final) | set(new_content))
+    stats["moved"] = len(moved_paths)
+    stats["kept"] = sum(1 for p in final if p not in moved_paths and p not in new_content)
+
+    created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    header = re.sub(r"^CREATED_UTC: .*$", f"CREATED_UTC: {created}", header, count=1, flags=re.MULTILINE)
+    header = re.sub(r"^FILES_INCLUDED: .*$", f"FILES_INCLUDED: {len(order)}", header, count=1, flags=re.MULTILINE)
+
+    out = Path(out_path).expanduser().resolve()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=out.parent, suffix=".tmp") as tf:
+        tf.write(header.encode("utf-8"))
+        for path in order:
+            if path in new_content:
+                data, line_map = new_content[path], None
+            else:
+                data, line_map = blocks[final[path]].raw(), blocks[final[path]].line_map
+            tf.write(f"FILE: {path}\n".encode("utf-8"))
+            if line_map:
+                tf.write(f"LINEMAP: {line_map}\n".encode("utf-8"))
+            tf.write(b"BEGIN\n")
+            tf.write(data)
+            if data and not data.endswith(b"\n"):
+                tf.write(b"\n")
+            tf.write(b"END\n\n")
+        tmp = Path(tf.name)
+    tmp.replace(out)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None, prog: str = "snapshot-tools.py") -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog=prog, description="Tools for SNAPSHOT v1 project dumps.")
+    ap.add_argument("snapshot", help="Path to snapshot file (e.g., project.txt)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_list = sub.add_parser("list", help="List file paths in snapshot")
+    p_list.add_argument("--limit", type=int, default=0, help="Limit output lines (0 = no limit)")
+
+    p_get = sub.add_parser("get", help="Print file contents by exact FILE: path")
+    p_get.add_argument("path", help="Exact path as stored in FILE: header")
+    p_get.add_argument("--head", type=int, default=0, help="Print only first N lines")
+    p_get.add_argument("--tail", type=int, default=0, help="Print only last N lines")
+
+    p_search = sub.add_parser("search", help="Regex search file contents with context")
+    p_search.add_argument("regex", help="Regex pattern")
+    p_search.add_argument("-C", "--context", type=int, default=3, help="Context lines around hits")
+    p_search.add_argument("-i", "--ignore-case", action="store_true", help="Case-insensitive search")
+
+    p_ff = sub.add_parser("ff", help="Fuzzy-ish find file paths by query")
+    p_ff.add_argument("query", help="Query string")
+    p_ff.add_argument("--limit", type=int, default=20, help="Max results")
+
+    p_apply = sub.add_parser("apply", help="Apply an EDITS v1 file to the snapshot (no repo rescan)")
+    p_apply.add_argument("edits", help="Path to EDITS v1 file")
+    p_apply.add_argument("--out", default=None, help="Updated snapshot path (default: <snapshot>.applied<ext>)")
+    p_apply.add_argument("--in-place", action="store_true", help="Rewrite the input snapshot instead of writing --out")
+    p_apply.add_argument(
+        "--to-disk",
+        action="store_true",
+        help="Also apply the edits to the repo (runs apply_edits.py); the snapshot is only written if that succeeds",
+    )
+    # Forwarded to apply_edits.py with --to-disk.
+    p_apply.add_argument("--no-git", action="store_true", help="--to-disk: do not use git mv/rm")
+    p_apply.add_argument("--backup-dir", default=".edits_backups", help="--to-disk: backup dir under ROOT")
+    p_apply.add_argument("--allow-outside-scope", action="store_true", help="--to-disk: allow edits anywhere under ROOT")
+    p_apply.add_argument("--force-delete-dir", action="store_true", help="--to-disk: allow deleting non-empty directories")
+    p_apply.add_argument("--jobs", type=int, default=None, help="--to-disk: parallel file writes")
+
+    p_export = sub.add_parser("export", help="Export snapshot into a folder")
+    p_export.add_argument("out_dir", help="Output directory")
+    p_export.add_argument("--strip-prefix", default=None, help="Remove this prefix from FILE paths")
+
+    args = ap.parse_args(argv)
+
+    if args.cmd == "list":
+        files = list_files(args.snapshot)
+        if args.limit and args.limit > 0:
+            files = files[: args.limit]
+        print("\n".join(files))
+        return
+
+    if args.cmd == "get":
+        fb = get_file(args.snapshot, args.path)
+        if not fb:
+            raise SystemExit(f"Not found: {args.path}")
+        if args.head and args.head > 0:
+            lines = fb.head(args.head)
+            if args.tail and args.tail > 0:
+                lines = lines[-args.tail :]
+        elif args.tail and args.tail > 0:
+            lines = fb.tail(args.tail)
+        else:
+            lines = fb.content.splitlines()
+        print("\n".join(lines))
+        return
+
+    if args.cmd == "search":
+        try:
+            results = search_regex(
+                args.snapshot,
+                args.regex,
+                context=args.context,
+                ignore_case=args.ignore_case,
+            )
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if not results:
+            print("No matches.")
+            return
+        print("\n".join(results))
+        return
+
+    if args.cmd == "ff":
+        hits = fuzzy_find_files(args.snapshot, args.query, limit=args.limit)
+        if not hits:
+            print("No matches.")
+            return
+        for score, path in hits:
+            print(f"{score:0.3f}\t{path}")
+        return
+
+    if args.cmd == "apply":
+        if args.in_place and args.out:
+            raise SystemExit("--out and --in-place are mutually exclusive")
+        if args.in_place:
+            out = args.snapshot
+        elif args.out:
+            out = args.out
+        else:
+            stem, ext = os.path.splitext(args.snapshot)
+            out = f"{stem}.applied{ext or '.txt'}"
+
+        from .edits import ApplyError, ParseError, PatchConflict
+
+        try:
+            if not args.to_disk:
+                stats = apply_edits_to_snapshot(args.snapshot, args.edits, out)
+            else:
+                # Build the new snapshot aside first (this validates PATCHes against it),
+                # apply to disk, and only then move it into place: a failed disk apply
+                # leaves both the old snapshot and --out untouched.
+                from .edits import iter_apply_edits, report_results
+
+                out_dir, out_name = os.path.split(os.path.abspath(out))
+                pending = os.path.join(out_dir, f".{out_name}.pending")
+                try:
+                    stats = apply_edits_to_snapshot(args.snapshot, args.edits, pending)
+                    results = iter_apply_edits(
+                        args.edits,
+                        no_git=args.no_git,
+                        backup_dir=args.backup_dir,
+                        allow_outside_scope=args.allow_outside_scope,
+                        force_delete_dir=args.force_delete_dir,
+                        jobs=args.jobs,
+                    )
+                    rc = report_results(results)
+                    if rc:
+                        raise SystemExit(f"[ERROR] Applying to disk failed (rc={rc}); snapshot not written: {out}")
+                    os.replace(pending, out)
+                finally:
+                    if os.path.exists(pending):
+                        os.unlink(pending)
+        except (ParseError, PatchConflict, ApplyError) as e:
+            raise SystemExit(f"[FATAL] {e}")
+        print(f"Snapshot updated: {out}")
+        print("  " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+        return
+
+    if args.cmd == "export":
+        n = export_snapshot(args.snapshot, args.out_dir, strip_prefix=args.strip_prefix)
+        print(f"Exported {n} files to {args.out_dir}")
+        return
@@ -0,0 +1,627 @@
+"""
+snapshot_kit.writer (CLI: scripts/snapshot.py or `python3 -m snapshot_kit snapshot`)
+
+Create a monolithic “snapshot” text file containing:
+- repo ROOT (absolute)
+- SCOPE (relative subdir under ROOT)
+- a list of text files with ABSOLUTE PATH + full contents
+
+This snapshot is meant to be pasted/uploaded to an AI so it can propose edits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import posixpath
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .classify import BINARY, Classifier, default_cache_path
+
+
+HEADER = "SNAPSHOT v1"
+
+# LLM-friendly structure message (written into output)
+STRUCTURE_MESSAGE = """\
+### FILE STRUCTURE (for LLMs)
+This snapshot is a concatenation of multiple source files.
+
+Parsing Tools:
+1) get list of files in the snapshot
+---
+grep "^FILE: " project.txt | sed 's/^FILE: //'
+---
+
+2) get file content by path
+---
+awk -v file="/Users/pavelkulikou/Projects/my-gym/gym-app/app/page.tsx" '
+  $0 ~ "^FILE: " file {found=1; next} 
+  found && /^BEGIN$/ {capture=1; next} 
+  found && /^END$/ {exit} 
+  capture {print}
+' project.txt
+---
+
+Parsing rules:
+- The file begins with a header section:
+    SNAPSHOT v1
+    ROOT: <absolute repo root>
+    SCOPE: <relative scope under root>
+    CREATED_UTC: <timestamp>
+
+- Then there are zero or more file blocks, each shaped exactly like:
+    FILE: <absolute path>
+    BEGIN
+    <file contents...>
+    END
+
+Notes:
+- Only treat text between BEGIN and END as the file contents.
+- Paths in FILE: are absolute.
+- File blocks are independent; do not assume implicit continuation across blocks.
+
+### BEGIN SNAPSHOT
+"""
+
+DEFAULT_EXCLUDES = [
+    "**/.git/**",
+    "**/node_modules/**",
+    "**/.next/**",
+    "**/dist/**",
+    "**/build/**",
+    "**/coverage/**",
+    "**/.turbo/**",
+    "**/.cache/**",
+    "**/.DS_Store",
+    "**/*.md"
+]
+
+# Directory names to prune during scanning (performance win)
+PRUNE_DIR_NAMES = {
+    ".git",
+    "node_modules",
+    ".next",
+    "dist",
+    "build",
+    "coverage",
+    ".turbo",
+    ".cache",
+}
+
+
+# Import slicing: which files are scanned for imports, and how specifiers resolve
+SLICE_SOURCE_EXTS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".mts", ".cts"}
+RESOLVE_EXTS = [".ts", ".tsx", ".d.ts", ".js", ".jsx", ".mjs", ".cjs", ".mts", ".cts", ".json", ".css"]
+
+IMPORT_RE = re.compile(
+    r"""(?:^|[^\w$.])(?:"""
+    r"""(?:import|export)\s[^'"]*?\sfrom\s*['"]([^'"]+)['"]"""  # import x from "y" / export * from "y"
+    r"""|import\s*['"]([^'"]+)['"]"""                          # import "y"
+    r"""|(?:import|require)\s*\(\s*['"]([^'"]+)['"]\s*\)"""    # import("y") / require("y")
+    r""")""",
+    re.MULTILINE,
+)
+
+
+@dataclass(frozen=True)
+class SnapshotFile:
+    abs_path: Path
+    rel_path_posix: str
+    content: str
+    line_map: Optional[str] = None  # encoded compact->original line map (see compact.py)
+
+
+def matches_any(path_posix: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(path_posix, pat) for pat in patterns)
+
+
+def normalize_patterns(patterns: List[str]) -> List[str]:
+    """
+    Keep user patterns glob-style, but make common forms friendlier.
+    - If user writes "app/**" while scope="my-app", they probably meant repo-relative.
+    - We don't rewrite aggressively; we just keep as-is and also allow matching against scope-relative.
+    """
+    return [p.strip() for p in patterns if p and p.strip()]
+
+
+def is_under(p: Path, base: Path) -> bool:
+    try:
+        p.relative_to(base)
+        return True
+    except ValueError:
+        return False
+
+
+def iter_files_pruned(scope_abs: Path) -> Iterable[Path]:
+    """
+    Walk files under scope, pruning heavy dirs early.
+    Using Path.rglob("*") gives no pruning hook, so we do a manual DFS.
+    """
+    stack = [scope_abs]
+    while stack:
+        cur = stack.pop()
+        try:
+            for child in cur.iterdir():
+                if child.is_dir():
+                    if child.name in PRUNE_DIR_NAMES:
+                        continue
+                    stack.append(child)
+                elif child.is_file():
+                    yield child
+        except PermissionError:
+            continue
+
+
+def find_tsconfig(scope_abs: Path, root: Path) -> Optional[Path]:
+    """
+    Nearest tsconfig.json at or above scope, not looking past root.
+    """
+    cur = scope_abs
+    while True:
+        cfg = cur / "tsconfig.json"
+        if cfg.is_file():
+            return cfg
+        if cur == root or cur.parent == cur:
+            return None
+        cur = cur.parent
+
+
+def load_tsconfig_paths(scope_abs: Path, root: Optional[Path] = None) -> Tuple[Path, Dict[str, List[str]]]:
+    """
+    Read compilerOptions.baseUrl/paths from the nearest tsconfig.json between scope
+    and root (best effort). Returns (base_dir, paths). Comments and trailing commas
+    are tolerated.
+    """
+    cfg = find_tsconfig(scope_abs, root or scope_abs)
+    if cfg is None:
+        return scope_abs, {}
+    try:
+        raw = cfg.read_text(encoding="utf-8")
+    except OSError:
+        return scope_abs, {}
+
+    # Strip // and /* */ comments outside strings, then trailing commas.
+    raw = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or "", raw, flags=re.S)
+    raw = re.sub(r",(\s*[}\]])", r"\1", raw)
+    try:
+        opts = json.loads(raw).get("compilerOptions", {})
+    except (ValueError, AttributeError):
+        return scope_abs, {}
+
+    base = (cfg.parent / opts.get("baseUrl", ".")).resolve()
+    paths = opts.get("paths") or {}
+    return base, {k: list(v) for k, v in paths.items() if isinstance(v, list)}
+
+
+def resolve_candidates(base: Path) -> Iterable[Path]:
+    """
+    Module-resolution order for a path without extension: exact, +ext, /index+ext.
+    """
+    yield base
+    for ext in RESOLVE_EXTS:
+        yield base.with_name(base.name + ext)
+    for ext in RESOLVE_EXTS:
+        yield base / f"index{ext}"
+
+
+def import_bases(spec: str, importer: Path, alias_base: Path, aliases: Dict[str, List[str]]) -> List[Path]:
+    """
+    Candidate base paths (before extension/index resolution) for an import specifier.
+    Only relative ("./", "../") and tsconfig alias specifiers have any; bare
+    package imports return [].
+    """
+    bases: List[Path] = []
+    if spec.startswith("."):
+        bases.append(importer.parent / spec)
+    else:
+        for pattern, targets in aliases.items():
+            if pattern.endswith("*"):
+                prefix = pattern[:-1]
+                if not spec.startswith(prefix):
+                    continue
+                rest = spec[len(prefix):]
+                bases.extend(alias_base / t.replace("*", rest, 1) for t in targets)
+            elif spec == pattern:
+                bases.extend(alias_base / t for t in targets)
+    # Path() keeps ".." segments; collapse them without touching the filesystem.
+    return [Path(posixpath.normpath(b.as_posix())) for b in bases]
+
+
+def resolve_import(
+    spec: str,
+    importer: Path,
+    known: Dict[Path, str],
+    alias_base: Path,
+    aliases: Dict[str, List[str]],
+    load: Optional[Callable[[Path], Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Resolve an import specifier to a repo-relative path of an included file.
+    Candidates not among the included files are offered to `load` (if given),
+    which may pull them in and return their repo-relative path.
+    """
+    bases = import_bases(spec, importer, alias_base, aliases)
+    for base in bases:
+        for cand in resolve_candidates(base):
+            rel = known.get(cand)
+            if rel is not None:
+                return rel
+    if load is not None:
+        for base in bases:
+            for cand in resolve_candidates(base):
+                rel = load(cand)
+                if rel is not None:
+                    return rel
+    return None
+
+
+def looks_like_alias(spec: str, aliases: Dict[str, List[str]]) -> bool:
+    """
+    True for specifiers that a tsconfig alias maps, or that use a common alias
+    prefix ("@/", "~/") — i.e. local imports that should have resolved.
+    """
+    if spec.startswith(("@/", "~/")):
+        return True
+    return any(spec.startswith(p[:-1]) if p.endswith("*") else spec == p for p in aliases)
+
+
+def build_import_graph(
+    files: List[SnapshotFile],
+    scope_abs: Path,
+    root: Optional[Path] = None,
+    load: Optional[Callable[[Path], Optional[SnapshotFile]]] = None,
+) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], List[SnapshotFile]]:
+    """
+    Build forward (imports) and reverse (imported-by) edges between included files.
+
+    If `load` is given, imports that resolve to files outside the included set (e.g.
+    "@/store/..." from a narrower scope) are loaded with it and walked as well; those
+    files are returned as the third element. Alias-looking imports that resolve
+    nowhere are reported with a warning.
+    """
+    known = {f.abs_path: f.rel_path_posix for f in files}
+    alias_base, aliases = load_tsconfig_paths(scope_abs, root)
+
+    deps: Dict[str, Set[str]] = {f.rel_path_posix: set() for f in files}
+    rdeps: Dict[str, Set[str]] = {f.rel_path_posix: set() for f in files}
+    pulled: List[SnapshotFile] = []
+    misses: Set[Path] = set()
+
+    def load_rel(p: Path) -> Optional[str]:
+        if load is None or p in misses:
+            return None
+        f = load(p)
+        if f is None:
+            misses.add(p)
+            return None
+        known[f.abs_path] = f.rel_path_posix
+        deps[f.rel_path_posix] = set()
+        rdeps[f.rel_path_posix] = set()
+        pulled.append(f)
+        queue.append(f)
+        return f.rel_path_posix
+
+    queue = deque(files)
+    while queue:
+        f = queue.popleft()
+        if f.abs_path.suffix not in SLICE_SOURCE_EXTS:
+            continue
+        for m in IMPORT_RE.finditer(f.content):
+            spec = m.group(1) or m.group(2) or m.group(3)
+            target = resolve_import(spec, f.abs_path, known, alias_base, aliases, load_rel)
+            if target is None:
+                if looks_like_alias(spec, aliases):
+                    print(f"[WARN] Unresolved import {spec!r} in {f.rel_path_posix}")
+                continue
+            if target != f.rel_path_posix:
+                deps[f.rel_path_posix].add(target)
+                rdeps[target].add(f.rel_path_posix)
+
+    return deps, rdeps, pulled
+
+
+def walk_graph(start: Iterable[str], edges: Dict[str, Set[str]], depth: int) -> Set[str]:
+    """
+    BFS over edges from start nodes. depth=0 means no limit.
+    """
+    seen: Set[str] = set(start)
+    queue = deque((n, 0) for n in seen)
+    while queue:
+        node, d = queue.popleft()
+        if depth and d >= depth:
+            continue
+        for nxt in edges.get(node, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append((nxt, d + 1))
+    return seen
+
+
+def slice_files(
+    files: List[SnapshotFile],
+    root: Path,
+    scope_abs: Path,
+    entries: List[str],
+    depth: int,
+    dependents: int,
+    load: Optional[Callable[[Path], Optional[SnapshotFile]]] = None,
+) -> List[SnapshotFile]:
+    """
+    Keep only entry files, their transitive imports (up to depth) and, if
+    dependents > 0, files importing the entries (up to that many levels).
+    With `load`, imports that leave the scope are followed too (see build_import_graph).
+    """
+    by_abs = {f.abs_path: f.rel_path_posix for f in files}
+    entry_rels: List[str] = []
+    for e in entries:
+        ep = Path(e).expanduser()
+        cands = [ep] if ep.is_absolute() else [scope_abs / ep, root / ep]
+        rel = next((by_abs[c.resolve()] for c in cands if c.resolve() in by_abs), None)
+        if rel is None:
+            raise ValueError(f"Entry not among included files: {e}")
+        entry_rels.append(rel)
+
+    deps, rdeps, pulled = build_import_graph(files, scope_abs, root, load)
+    keep = walk_graph(entry_rels, deps, depth)
+    if dependents > 0:
+        keep |= walk_graph(entry_rels, rdeps, dependents)
+
+    kept = [f for f in files + pulled if f.rel_path_posix in keep]
+    kept.sort(key=lambda x: x.rel_path_posix)
+    return kept
+
+
+def iter_snapshot_files(
+    root: Path,
+    scope_abs: Path,
+    includes: List[str],
+    excludes: List[str],
+    max_bytes: int,
+    classifier: Optional[Classifier] = None,
+) -> Iterator[SnapshotFile]:
+    """
+    Yield included text files under scope (unsorted, one at a time).
+    Binaries are rejected by the classifier (extension, cache, magic bytes) before
+    any full read; pass one with a cache path to reuse decisions across runs.
+    """
+    classifier = classifier or Classifier()
+    for p in iter_files_pruned(scope_abs):
+        # Match patterns against repo-relative posix path
+        try:
+            rel_repo = p.relative_to(root).as_posix()
+        except ValueError:
+            # Shouldn't happen if scope is under root, but keep it safe.
+            continue
+
+        if matches_any(rel_repo, excludes):
+            continue
+
+        # Includes are intended as repo-relative globs in the examples.
+        # Additionally, allow matching against scope-relative to be forgiving.
+        if includes:
+            rel_scope = p.relative_to(scope_abs).as_posix()
+            if not (matches_any(rel_repo, includes) or matches_any(rel_scope, includes)):
+                continue
+
+        f = read_snapshot_file(p, rel_repo, max_bytes, classifier)
+        if f is not None:
+            yield f
+
+
+def read_snapshot_file(p: Path, rel_repo: str, max_bytes: int, classifier: Classifier) -> Optional[SnapshotFile]:
+    """
+    Load one candidate file, or None if it is too large, binary or not UTF-8.
+    """
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    if st.st_size > max_bytes:
+        return None
+
+    if classifier.classify(p, st) == BINARY:
+        return None
+
+    try:
+        content = p.read_text(encoding="utf-8")
+    except (UnicodeDecodeError, OSError):
+        return None
+
+    return SnapshotFile(abs_path=p, rel_path_posix=rel_repo, content=content)
+
+
+def collect_files(
+    root: Path,
+    scope_abs: Path,
+    includes: List[str],
+    excludes: List[str],
+    max_bytes: int,
+    classifier: Optional[Classifier] = None,
+) -> List[SnapshotFile]:
+    files = list(iter_snapshot_files(root, scope_abs, includes, excludes, max_bytes, classifier))
+    files.sort(key=lambda x: x.rel_path_posix)
+    return files
+
+
+def compact_files(files: List[SnapshotFile]) -> Tuple[List[SnapshotFile], List[Tuple[str, int, int]]]:
+    """
+    Apply per-language compaction (see compact.py). Returns the new files and
+    (rel path, original bytes, compacted bytes) for every file that shrank.
+    """
+    from .compact import COMPACT_EXTS, compact, encode_line_map
+
+    out: List[SnapshotFile] = []
+    saved: List[Tuple[str, int, int]] = []
+    for f in files:
+        if f.abs_path.suffix.lower() not in COMPACT_EXTS:
+            out.append(f)
+            continue
+        text, line_map = compact(f.content, f.abs_path.suffix)
+        before = len(f.content.encode("utf-8"))
+        after = len(text.encode("utf-8"))
+        if after >= before:
+            out.append(f)
+            continue
+        out.append(SnapshotFile(f.abs_path, f.rel_path_posix, text, encode_line_map(line_map)))
+        saved.append((f.rel_path_posix, before, after))
+    return out, saved
+
+
+def print_compaction_report(saved: List[Tuple[str, int, int]]) -> None:
+    from .compact import estimate_tokens
+
+    for rel, before, after in sorted(saved, key=lambda x: x[1] - x[2], reverse=True):
+        pct = 100.0 * (before - after) / before
+        print(f"[COMPACT] {rel}: {before} -> {after} bytes (-{pct:.1f}%), ~{estimate_tokens(before - after)} tokens saved")
+    total_before = sum(b for _, b, _ in saved)
+    total_after = sum(a for _, _, a in saved)
+    print(
+        f"[COMPACT] {len(saved)} file(s): {total_before} -> {total_after} bytes, "
+        f"~{estimate_tokens(total_before - total_after)} tokens saved"
+    )
+
+
+def write_snapshot(
+    out: Path,
+    root: Path,
+    scope_rel: Path,
+    files: List[SnapshotFile],
+    compacted: bool = False,
+) -> None:
+    created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    with out.open("w", encoding="utf-8", newline="") as fp:
+        fp.write(STRUCTURE_MESSAGE)
+        fp.write(f"{HEADER}\n")
+        fp.write(f"ROOT: {root.as_posix()}\n")
+        fp.write(f"SCOPE: {scope_rel.as_posix()}\n")
+        fp.write(f"CREATED_UTC: {created}\n")
+        if compacted:
+            fp.write(
+                "COMPACTED: comments stripped, whitespace collapsed; "
+                "a 'LINEMAP: <line>:<original line> ...' line after FILE: maps lines back to the original file. "
+                "Compacted contents are NOT the files on disk: a FILE block copied from them drops the stripped "
+                "comments, and PATCH context/removed lines copied from them may not match the real file\n"
+            )
+        fp.write(f"FILES_INCLUDED: {len(files)}\n\n")
+
+        for f in files:
+            fp.write(f"FILE: {f.abs_path.as_posix()}\n")
+            if f.line_map:
+                fp.write(f"LINEMAP: {f.line_map}\n")
+            fp.write("BEGIN\n")
+            fp.write(f.content)
+            if not f.content.endswith("\n"):
+                fp.write("\n")
+            fp.write("END\n\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Create a monolithic repo snapshot (SNAPSHOT v1).")
+    ap.add_argument("--root", default=".", help="Repo root directory (default: .)")
+    ap.add_argument("--scope", default=".", help="Scope folder relative to root (default: .)")
+    ap.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="Glob include (repeatable). If empty, includes all under scope.",
+    )
+    ap.add_argument("--exclude", action="append", default=[], help="Glob exclude (repeatable).")
+    ap.add_argument("--max-bytes", type=int, default=700_000, help="Skip files larger than this many bytes.")
+    ap.add_argument(
+    "--out",
+    help="Output snapshot file (default: project-snapshot-{date}-{time}.txt)."
+    )
+    ap.add_argument("--dry-run", action="store_true", help="Print included files and exit.")
+    ap.add_argument(
+        "--entry",
+        action="append",
+        default=[],
+        help="Slice: keep only this file and its transitive imports (repeatable; scope- or root-relative).",
+    )
+    ap.add_argument("--depth", type=int, default=0, help="Slice: max import depth from entries (0 = no limit).")
+    ap.add_argument(
+        "--dependents",
+        type=int,
+        default=0,
+        help="Slice: also include files importing the entries, up to N levels (default: 0 = none).",
+    )
+    ap.add_argument(
+        "--compact",
+        action="store_true",
+        help="Strip comments and collapse whitespace in TS/JS/CSS/JSON (adds LINEMAP lines; contents then differ from disk).",
+    )
+    ap.add_argument(
+        "--classify-cache",
+        default=str(default_cache_path()),
+        help="Text/binary decision cache, keyed by path+size+mtime (default: %(default)s).",
+    )
+    ap.add_argument("--no-classify-cache", action="store_true", help="Do not read or write the classification cache.")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root).expanduser().resolve()
+    scope_rel = Path(args.scope)
+    scope_abs = (root / scope_rel).resolve()
+
+    if not root.exists():
+        raise SystemExit(f"[FATAL] ROOT not found: {root}")
+    if not scope_abs.exists():
+        raise SystemExit(f"[FATAL] SCOPE not found: {scope_abs}")
+
+    includes: List[str] = normalize_patterns(args.include)
+    excludes: List[str] = DEFAULT_EXCLUDES + normalize_patterns(args.exclude)
+
+    classifier = Classifier(None if args.no_classify_cache else Path(args.classify_cache).expanduser())
+    files = collect_files(root, scope_abs, includes, excludes, args.max_bytes, classifier)
+
+    if args.entry:
+        def load_outside(p: Path) -> Optional[SnapshotFile]:
+            # Imports leaving the scope (but not ROOT) are followed, under the same filters.
+            if is_under(p, scope_abs) or not is_under(p, root) or not p.is_file():
+                return None
+            rel_repo = p.relative_to(root).as_posix()
+            if matches_any(rel_repo, excludes) or any(d in PRUNE_DIR_NAMES for d in rel_repo.split("/")[:-1]):
+                return None
+            return read_snapshot_file(p, rel_repo, args.max_bytes, classifier)
+
+        n_scoped = len(files)
+        try:
+            files = slice_files(files, root, scope_abs, args.entry, args.depth, args.dependents, load_outside)
+        except ValueError as e:
+            raise SystemExit(f"[FATAL] {e}")
+        outside = sum(1 for f in files if not is_under(f.abs_path, scope_abs))
+        if outside:
+            print(f"[SLICE] Kept {len(files)} file(s); {outside} imported from outside SCOPE (of {n_scoped} in scope)")
+    classifier.save(prune_under=scope_abs)
+
+    if args.compact:
+        files, saved = compact_files(files)
+        print_compaction_report(saved)
+
+    if args.dry_run:
+        print(f"[DRYRUN] ROOT:  {root}")
+        print(f"[DRYRUN] SCOPE: {scope_rel.as_posix()}")
+        print(f"[DRYRUN] Files: {len(files)}")
+        print("[DRYRUN] Classified: " + ", ".join(f"{k}={v}" for k, v in classifier.stats.items()))
+        for f in files:
+            print(f"  {f.rel_path_posix}")
+        return 0
+
+    if not args.out:
+        ts = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        args.out = f"project-snapshot-{ts}.txt"
+
+    out = Path(args.out).expanduser().resolve()
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    write_snapshot(out, root, scope_rel, files, compacted=args.compact)
+
+    print(f"[OK] Snapshot written: {out}")
+    print(f"[OK] Files included: {len(files)}")
+    return 0